@@ -1,7 +1,7 @@
 import pandas as pd
 import datetime as dt
 from pathlib import Path
-from src.data_loader import load_ledger
+from src.data_loader import NamedBytesIO, load_ledger
 from src.business_logic import (
     classify_transactions,
     detect_addbacks,
@@ -18,37 +18,7 @@ def analyze():
     file_path = Path("Bank Ledger through 11142025.csv")
     print(f"Loading {file_path}...")
     
-    # Wrap file for load_ledger
-    class FileWrapper:
-        def __init__(self, path):
-            self.path = path
-            self.name = str(path)
-        
-        def seek(self, *args):
-            return self.f.seek(*args)
-            
-        def read(self, *args):
-            return self.f.read(*args)
-
-        def __enter__(self):
-            self.f = open(self.path, 'rb')
-            return self
-            
-        def __exit__(self, *args):
-            self.f.close()
-
-    # We need to pass an open file object that also has a .name attribute
-    with open(file_path, 'rb') as f:
-        # Create a dummy object that proxies to f but has .name
-        class UploadedFile:
-            def __init__(self, file_obj, name):
-                self._file = file_obj
-                self.name = name
-            def __getattr__(self, attr):
-                return getattr(self._file, attr)
-        
-        uploaded = UploadedFile(f, file_path.name)
-        df = load_ledger(uploaded)
+    df = load_ledger(NamedBytesIO.from_path(file_path))
 
     if df is None:
         print("Failed to load ledger.")
@@ -16,12 +16,13 @@ from src.business_logic import (
     get_period_metrics,
     compute_legacy_overhead_addins,
     apply_legacy_overhead_addins,
+    date_window,
 )
 from src.kpi_lab import compute_monthly_kpis
 from src.forecasting import calculate_run_rates, forecast_year_1
 from src.billing import load_green_sheets, JobBillingConfig, compute_period_billing
 from src.account_view import build_account_summary
-from src.addback_rules import default_rules, load_rules, rules_to_jsonable
+from src.addback_rules import default_rules, load_rules
 from src.reconciliation import (
     normalize_bank_register,
     normalize_qb_ledger_for_bank,
@@ -33,6 +34,17 @@ from src.reconciliation import (
 APP_SETTINGS_PATH = Path(__file__).resolve().parent / "config" / "app_settings.json"
 ADDBACK_RULES_PATH = Path(__file__).resolve().parent / "data" / "addback_rules.json"
 
+# Column formats are built once at import instead of on every rerun.
+def _currency_columns(*cols: str) -> dict:
+    return {col: st.column_config.NumberColumn(format="$%.2f") for col in cols}
+
+
+MONTHLY_SUMMARY_COLUMN_CONFIG = _currency_columns(
+    "revenue", "cogs", "overhead", "other_expense", "net_profit", "addbacks", "sde"
+)
+ADDBACKS_BY_MONTH_COLUMN_CONFIG = _currency_columns("addbacks")
+BRIDGE_COLUMN_CONFIG = _currency_columns("Amount")
+
 
 def _load_app_settings() -> dict:
     try:
@@ -54,6 +66,103 @@ def _persist_app_settings(update: dict) -> None:
         return
 
 
+def _load_ledger_snapshot(uploaded_file) -> pd.DataFrame | None:
+    """Load (and date-normalize) the uploaded ledger once per upload.
+
+    Streamlit re-executes the whole script on every widget interaction, so the
+    normalized frame is kept in session state keyed by the upload identity and
+    reused until a different file is uploaded.
+    """
+    key = (
+        getattr(uploaded_file, "file_id", None) or getattr(uploaded_file, "name", ""),
+        getattr(uploaded_file, "size", None),
+    )
+    snapshot = st.session_state.get("_ledger_snapshot")
+    if snapshot is not None and snapshot[0] == key:
+        return snapshot[1]
+
+    df = load_ledger(uploaded_file)
+
+    # Force date type again to prevent PyArrow errors; keep rows in date order so
+    # date windows can be located by binary search (see date_window).
+    if df is not None and "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+        df = df.sort_values("date", kind="stable")
+
+    st.session_state["_ledger_snapshot"] = (key, df)
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def _monthly_kpi_view(report_df: pd.DataFrame, report_start: dt.date) -> pd.DataFrame:
+    """Monthly KPIs for the report window, memoized on the report frame.
+
+    Widget interactions that leave the report rows unchanged (tab switches,
+    debug toggles, editor clicks) reuse the cached table instead of
+    re-aggregating the ledger. The view is made Arrow-safe here, once, so the
+    chart and table projections taken from it need no further coercion.
+    """
+    monthly_kpis = compute_monthly_kpis(report_df, owner_revenue_start=report_start)
+    if monthly_kpis.empty:
+        return monthly_kpis
+
+    # Months come back sorted, so the cutoff only needs applying when the first
+    # month precedes it (report_df normally already starts inside that month).
+    start_period = pd.Period(report_start, freq="M")
+    if monthly_kpis["month"].iat[0] < start_period:
+        monthly_kpis = monthly_kpis.loc[monthly_kpis["month"] >= start_period].reset_index(drop=True)
+        if monthly_kpis.empty:
+            return monthly_kpis
+    return make_arrow_safe(monthly_kpis)
+
+
+@st.cache_data(show_spinner=False)
+def _overview_frames(monthly_view: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Chart- and table-ready projections of the monthly view (series, margins, summary).
+
+    Chart series are downcast to float32 (half the bytes shipped to the browser);
+    the summary table keeps float64 so currency cells stay exact to the cent.
+    """
+    series_df = (
+        monthly_view[["month_str", "revenue", "net_profit", "sde"]]
+        .set_index("month_str")
+        .astype("float32")
+    )
+    # Margin columns are float64 already (NaN where revenue is zero).
+    margin_df = (
+        monthly_view[["month_str", "net_margin_pct", "sde_margin_pct"]]
+        .rename(
+            columns={
+                "net_margin_pct": "Net Margin %",
+                "sde_margin_pct": "SDE Margin %",
+            },
+        )
+        .set_index("month_str")
+        .astype("float32")
+    )
+    summary = monthly_view[[
+        "month_str",
+        "revenue",
+        "cogs",
+        "overhead",
+        "other_expense",
+        "net_profit",
+        "addbacks",
+        "sde",
+    ]].rename(columns={"month_str": "Month"})
+    return series_df, margin_df, summary
+
+
+def _is_arrow_native(d: pd.DataFrame) -> bool:
+    """True when no column (or the index) needs coercion for Arrow serialization."""
+    if getattr(d.index, "dtype", None) == "object":
+        return False
+    for t in d.dtypes:
+        if t == "object" or isinstance(t, pd.PeriodDtype) or pd.api.types.is_datetime64_any_dtype(t):
+            return False
+    return True
+
+
 def make_arrow_safe(
     d: pd.DataFrame,
     debug_label: str | None = None,
@@ -67,7 +176,11 @@ def make_arrow_safe(
     Timestamps) can trigger Arrow conversion warnings.
 
     This function coerces common problematic columns into Arrow-friendly types.
+    Frames that are already Arrow-friendly are returned as-is (no copy).
     """
+    if _is_arrow_native(d):
+        return d
+
     out = d.copy()
 
     converted_cols: list[str] = []
@@ -233,7 +346,7 @@ with st.sidebar.expander("Classification Tuning"):
     )
     cogs_prefixes = {x.strip() for x in st.session_state["cogs_prefixes_str"].split(",") if x.strip()}
 
-ledger_file = st.sidebar.file_uploader("Upload QuickBooks Ledger Export", type=["csv", "xlsx", "xls"])
+ledger_file = st.sidebar.file_uploader("Upload QuickBooks Ledger Export", type=["csv", "gz", "xlsx", "xls"])
 
 # ---------------------------------------------------------
 # DATA PROCESSING
@@ -241,7 +354,7 @@ ledger_file = st.sidebar.file_uploader("Upload QuickBooks Ledger Export", type=[
 if ledger_file:
     with st.spinner("Processing Ledger..."):
         try:
-            df = load_ledger(ledger_file)
+            df = _load_ledger_snapshot(ledger_file)
 
             if debug_mode:
                 with st.expander("Debug: Ledger load", expanded=False):
@@ -249,51 +362,48 @@ if ledger_file:
                     if df is not None:
                         st.write(f"Rows: {len(df)}")
 
-            # Force date type again to prevent PyArrow errors
-            if "date" in df.columns:
-                df["date"] = pd.to_datetime(df["date"], errors="coerce")
-
             if debug_mode:
                 with st.expander("Debug: Ledger columns / head", expanded=False):
-                    st.write("Columns:", df.columns.tolist())
-                    st_dataframe_stretch(
-                        make_arrow_safe(df.head(), debug_label="LEDGER_HEAD", debug_mode=debug_mode)
-                    )
-
-                    # 🔍 Sanity checks
-                    if "amount" in df.columns:
-                        st.write("amount sample:", df["amount"].head())
-                        st.write("total amount:", float(df["amount"].sum()))
-
-                    if "account_type" in df.columns:
-                        st.write("account_type counts:", df["account_type"].value_counts())
-                        income_mask = df["account_type"].str.contains("income", case=False, na=False)
-                        st.write(
-                            "raw income sum (amount):",
-                            float(df.loc[income_mask, "amount"].sum())
+                    if st.checkbox("Load ledger details", key="debug_ledger_head_open"):
+                        st.write("Columns:", df.columns.tolist())
+                        st_dataframe_stretch(
+                            make_arrow_safe(df.head(), debug_label="LEDGER_HEAD", debug_mode=debug_mode)
                         )
+
+                        # 🔍 Sanity checks
+                        if "amount" in df.columns:
+                            st.write("amount sample:", df["amount"].head())
+                            st.write("total amount:", float(df["amount"].sum()))
+
+                        if "account_type" in df.columns:
+                            st.write("account_type counts:", df["account_type"].value_counts())
+                            income_mask = df["account_type"].str.contains("income", case=False, na=False)
+                            st.write(
+                                "raw income sum (amount):",
+                                float(df.loc[income_mask, "amount"].sum())
+                            )
             
             if df is not None:
                 # 1. Classify
                 df = classify_transactions(df, cogs_prefixes=cogs_prefixes)
                 
                 # 2. Addbacks
-                file_rules: list[dict] = []
+                # load_rules caches the parsed rules until the JSON file changes,
+                # so reruns don't re-read or re-parse it.
                 try:
-                    if ADDBACK_RULES_PATH.exists():
-                        file_rules = json.loads(ADDBACK_RULES_PATH.read_text(encoding="utf-8"))
-                        if not isinstance(file_rules, list):
-                            file_rules = []
+                    file_rules = load_rules(ADDBACK_RULES_PATH)
                 except Exception:
                     file_rules = []
 
-                rules = rules_to_jsonable(default_rules()) + file_rules
+                rules = default_rules() + file_rules
                 df = detect_addbacks(df, custom_tokens=custom_addback_tokens, rules=rules)
 
                 # 3. Compute report-window metrics (QB P&L style): report_start -> today
-                report_mask = (df["date"].dt.date >= report_start) & (df["date"].dt.date <= today)
-                is_pnl = df.get("is_pnl", pd.Series([True] * len(df), index=df.index)).astype(bool)
-                report_df = df.loc[report_mask & is_pnl].copy()
+                report_start_ts = pd.Timestamp(report_start)
+                report_end_ts = pd.Timestamp(today) + pd.Timedelta(days=1)
+                report_window = date_window(df, report_start_ts, report_end_ts)
+                is_pnl = report_window.get("is_pnl", pd.Series(True, index=report_window.index)).astype(bool)
+                report_df = report_window.loc[is_pnl]
                 qb_pnl_metrics = get_period_metrics(report_df, report_start, today)
 
                 # 4. Optional legacy overhead add-ins (prior calendar month)
@@ -314,23 +424,21 @@ if ledger_file:
                     )
 
                     if include_legacy_overhead:
-                        is_pnl = df.get("is_pnl", pd.Series([True] * len(df), index=df.index)).astype(bool)
-                        legacy_overhead_mask = (
-                            (df["date"].dt.date >= legacy_start)
-                            & (df["date"].dt.date <= legacy_end)
-                            & (df.get("is_overhead", False).astype(bool))
-                            & is_pnl
+                        legacy_window = date_window(
+                            df, pd.Timestamp(legacy_start), pd.Timestamp(legacy_end) + pd.Timedelta(days=1)
                         )
-                        legacy_df = df.loc[legacy_overhead_mask, ["_row_id", "date", "account", "name", "memo", "amount"]].copy()
-                        legacy_df = legacy_df.sort_values("date")
+                        is_pnl = legacy_window.get("is_pnl", pd.Series(True, index=legacy_window.index)).astype(bool)
+                        legacy_overhead_mask = legacy_window.get("is_overhead", False).astype(bool) & is_pnl
+                        # The window's rows are sliced once; row selections below only re-scan these.
+                        legacy_rows = legacy_window.loc[legacy_overhead_mask]
+                        legacy_df = legacy_rows[["_row_id", "date", "account", "name", "memo", "amount"]].sort_values("date")
 
                         if legacy_df.empty:
                             st.caption("No July overhead transactions found.")
                         else:
-                            editor = legacy_df.copy()
-                            editor.insert(0, "include", False)
+                            legacy_df.insert(0, "include", False)
                             edited = st.data_editor(
-                                editor,
+                                legacy_df,
                                 hide_index=True,
                                 disabled=["_row_id", "date", "account", "name", "memo", "amount"],
                                 column_config={
@@ -346,7 +454,7 @@ if ledger_file:
 
                             if selected_ids:
                                 legacy_overhead_included_total = compute_legacy_overhead_addins(
-                                    df,
+                                    legacy_rows,
                                     legacy_start=legacy_start,
                                     legacy_end=legacy_end,
                                     included_row_ids=selected_ids,
@@ -388,24 +496,28 @@ if ledger_file:
                 col3.metric("Net Profit (Report Window)", currency(net_ytd))
                 col4.metric("Projected Year-1 Net Profit", currency(net_proj))
 
+                # Bridge amounts, shared by the expander below, the UAT payload and the Reconciliation tab.
+                qb_net_start_plus = float(qb_pnl_metrics.get("net_profit", 0.0))
+                legacy_overhead = float(legacy_overhead_included_total)
+                adjusted_net = float(active_metrics.get("net_profit", 0.0))
+                bridge_amounts = [qb_net_start_plus, -legacy_overhead, adjusted_net]
+
                 # Owner vs QB bridge (always shown; small + scannable)
                 with st.expander("Reconciliation Bridge (Report Net vs Legacy Add-ins)", expanded=False):
-                    qb_net_start_plus = float(qb_pnl_metrics.get("net_profit", 0.0))
-                    legacy_overhead = float(legacy_overhead_included_total)
-                    adjusted_net = float(active_metrics.get("net_profit", 0.0))
-
-                    bridge_rows = [
-                        {"Step": f"QB Net Profit ({report_start}+) ", "Amount": qb_net_start_plus},
-                        {"Step": "Less: Legacy overhead add-ins (prior month)", "Amount": -legacy_overhead},
-                        {"Step": "Equals: Net Profit (Adjusted)", "Amount": adjusted_net},
-                    ]
-                    bridge_df = pd.DataFrame(bridge_rows)
-                    bridge_df_safe = make_arrow_safe(
+                    bridge_df = pd.DataFrame(
+                        {
+                            "Step": [
+                                f"QB Net Profit ({report_start}+) ",
+                                "Less: Legacy overhead add-ins (prior month)",
+                                "Equals: Net Profit (Adjusted)",
+                            ],
+                            "Amount": bridge_amounts,
+                        }
+                    )
+                    st_dataframe_stretch(
                         bridge_df,
-                        debug_label="RECONCILIATION_BRIDGE",
-                        debug_mode=debug_mode,
+                        column_config=BRIDGE_COLUMN_CONFIG,
                     )
-                    st_dataframe_stretch(bridge_df_safe.style.format({"Amount": currency}))
 
                 if debug_mode:
                     try:
@@ -452,9 +564,9 @@ if ledger_file:
                                 "other_expense": float(qb_pnl_metrics.get("other_expense", 0.0)),
                             },
                             "reconciliation_bridge": {
-                                "qb_net_start_plus": float(qb_pnl_metrics.get("net_profit", 0.0)),
-                                "legacy_overhead_included": float(legacy_overhead_included_total),
-                                "adjusted_net": float(active_metrics.get("net_profit", 0.0)),
+                                "qb_net_start_plus": qb_net_start_plus,
+                                "legacy_overhead_included": legacy_overhead,
+                                "adjusted_net": adjusted_net,
                             },
                             "run_rates": {
                                 "monthly_revenue": float(run_rates.get("revenue", 0.0)),
@@ -481,12 +593,7 @@ if ledger_file:
                 ])
 
                 # Precompute monthly KPIs for the report window
-                monthly_kpis = compute_monthly_kpis(report_df, owner_revenue_start=report_start)
-                if monthly_kpis.empty:
-                    monthly_view = monthly_kpis
-                else:
-                    start_period = pd.Period(report_start, freq="M")
-                    monthly_view = monthly_kpis.loc[monthly_kpis["month"] >= start_period].copy()
+                monthly_view = _monthly_kpi_view(report_df, report_start)
 
                 with tab_overview:
                     if debug_mode:
@@ -502,48 +609,16 @@ if ledger_file:
                         if monthly_view.empty:
                             st.info("No monthly data available for the report window.")
                         else:
-                            series_df = monthly_view[["month_str", "revenue", "net_profit", "sde"]].copy()
-                            series_df = series_df.set_index("month_str")
+                            series_df, margin_df, summary = _overview_frames(monthly_view)
                             st.line_chart(series_df)
 
                             st.markdown("#### Margin % (Net, SDE)")
-                            margin_df = monthly_view[["month_str", "net_margin_pct", "sde_margin_pct"]].copy()
-                            margin_df.rename(
-                                columns={
-                                    "net_margin_pct": "Net Margin %",
-                                    "sde_margin_pct": "SDE Margin %",
-                                },
-                                inplace=True,
-                            )
-                            margin_df["Net Margin %"] = pd.to_numeric(margin_df["Net Margin %"], errors="coerce")
-                            margin_df["SDE Margin %"] = pd.to_numeric(margin_df["SDE Margin %"], errors="coerce")
-                            st.line_chart(margin_df.set_index("month_str"))
+                            st.line_chart(margin_df)
 
                             st.markdown("#### Monthly Summary")
-                            summary = monthly_view[[
-                                "month_str",
-                                "revenue",
-                                "cogs",
-                                "overhead",
-                                "other_expense",
-                                "net_profit",
-                                "addbacks",
-                                "sde",
-                            ]].copy()
-                            summary.rename(columns={"month_str": "Month"}, inplace=True)
-                            summary_safe = make_arrow_safe(summary, debug_label="OVERVIEW_MONTHLY_SUMMARY", debug_mode=debug_mode)
                             st_dataframe_stretch(
-                                summary_safe.style.format(
-                                    {
-                                        "revenue": currency,
-                                        "cogs": currency,
-                                        "overhead": currency,
-                                        "other_expense": currency,
-                                        "net_profit": currency,
-                                        "addbacks": currency,
-                                        "sde": currency,
-                                    }
-                                )
+                                summary,
+                                column_config=MONTHLY_SUMMARY_COLUMN_CONFIG,
                             )
                     except Exception as e:
                         st.error(f"TAB_ERROR::OVERVIEW: {e}")
@@ -601,23 +676,28 @@ if ledger_file:
                             )
 
                         st.markdown("#### Addbacks by Month")
-                        addback_rows = report_df.loc[report_df.get("sde_addback_flag", False).astype(bool)].copy()
+                        addback_rows = report_df.loc[report_df.get("sde_addback_flag", False).astype(bool)]
                         if addback_rows.empty:
                             st.info("No addbacks detected in the report window.")
                         else:
-                            addback_rows["month"] = addback_rows["date"].dt.to_period("M")
-                            by_month = (
-                                addback_rows.groupby("month")
-                                .agg(
-                                    addbacks=("amount", lambda s: float(pd.to_numeric(s, errors="coerce").fillna(0.0).abs().sum())),
-                                    count=("amount", "size"),
-                                )
-                                .reset_index()
+                            # Single-key sums: bincount over month codes instead of a hash groupby.
+                            # Months come from a datetime64[M] cast; only the unique months get labels.
+                            month_keys = addback_rows["date"].to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+                            codes, months = pd.factorize(month_keys, sort=True)
+                            valid = codes >= 0
+                            amounts = pd.to_numeric(addback_rows["amount"], errors="coerce").fillna(0.0).abs().to_numpy()
+                            by_month = pd.DataFrame(
+                                {
+                                    "Month": pd.DatetimeIndex(months).strftime("%b %Y"),
+                                    "addbacks": np.bincount(codes[valid], weights=amounts[valid], minlength=len(months)),
+                                    "count": np.bincount(codes[valid], minlength=len(months)),
+                                }
                             )
-                            by_month["month_str"] = by_month["month"].dt.to_timestamp().dt.strftime("%b %Y")
-                            by_month = by_month[["month_str", "addbacks", "count"]].rename(columns={"month_str": "Month"})
                             by_month_safe = make_arrow_safe(by_month, debug_label="ADDBACKS_BY_MONTH", debug_mode=debug_mode)
-                            st_dataframe_stretch(by_month_safe.style.format({"addbacks": currency}))
+                            st_dataframe_stretch(
+                                by_month_safe,
+                                column_config=ADDBACKS_BY_MONTH_COLUMN_CONFIG,
+                            )
                     except Exception as e:
                         st.error(f"TAB_ERROR::ADDBACKS: {e}")
                         if debug_mode:
@@ -630,18 +710,20 @@ if ledger_file:
                         st.subheader("Reconciliation")
                         st.caption("QB-style bridge showing adjustments from QB P&L (8/1+) to app-adjusted figures.")
 
-                        qb_net_start_plus = float(qb_pnl_metrics.get("net_profit", 0.0))
-                        legacy_overhead = float(legacy_overhead_included_total)
-                        adjusted_net = float(active_metrics.get("net_profit", 0.0))
-
-                        bridge_rows = [
-                            {"Step": f"QB Net Profit ({report_start} to {today})", "Amount": qb_net_start_plus},
-                            {"Step": f"Less: July overhead add-in (selected: {selected_legacy_overhead_rows_count})", "Amount": -legacy_overhead},
-                            {"Step": "Equals: App Net Profit (Adjusted)", "Amount": adjusted_net},
-                        ]
-                        bridge_df = pd.DataFrame(bridge_rows)
-                        bridge_df_safe = make_arrow_safe(bridge_df, debug_label="RECONCILIATION_BRIDGE", debug_mode=debug_mode)
-                        st_dataframe_stretch(bridge_df_safe.style.format({"Amount": currency}))
+                        bridge_df = pd.DataFrame(
+                            {
+                                "Step": [
+                                    f"QB Net Profit ({report_start} to {today})",
+                                    f"Less: July overhead add-in (selected: {selected_legacy_overhead_rows_count})",
+                                    "Equals: App Net Profit (Adjusted)",
+                                ],
+                                "Amount": bridge_amounts,
+                            }
+                        )
+                        st_dataframe_stretch(
+                            bridge_df,
+                            column_config=BRIDGE_COLUMN_CONFIG,
+                        )
 
                         st.markdown("#### Notes")
                         st.write("• Core P&L window is fixed to start 2025-08-01.")
@@ -653,8 +735,9 @@ if ledger_file:
 
                 if debug_mode:
                     with st.expander("Debug details", expanded=False):
-                        st.markdown("#### Ledger (head)")
-                        st_dataframe_stretch(make_arrow_safe(df.head(50), debug_label="LEDGER_HEAD", debug_mode=debug_mode))
+                        if st.checkbox("Load ledger head", key="debug_details_open"):
+                            st.markdown("#### Ledger (head)")
+                            st_dataframe_stretch(make_arrow_safe(df.head(50), debug_label="LEDGER_HEAD", debug_mode=debug_mode))
 
         except Exception as e:
             st.error(f"An error occurred during processing: {e}")
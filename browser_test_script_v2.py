@@ -1,154 +1,182 @@
-import time
+import asyncio
 import json
-from playwright.sync_api import sync_playwright
+import os
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError, async_playwright
+
+from scripts._uat_common import block_static_assets
+
+APP_URL = "http://localhost:8501"
+TAB_SELECTOR = "button, a, [role='tab']"
+STATE_PATH = "pw_state.json"
+DATA_READY_SELECTOR = "[data-testid='stDataFrame'], [data-testid='stMetric']"
+
+TABS = [
+    "📈 Forecast & Run Rates",
+    "🔍 Addbacks Analysis",
+    "📋 Data Inspection",
+    "📑 Project Billing Digital Twin",
+    "📚 Accounts & SDE Tuning",
+    "⚖️ Reconciliation",
+    "📊 KPI Explorer"
+]
+
+
+async def load_app_with_ledger(context, label):
+    """Open the app in ``context``, set the sidebar dates and upload the ledger."""
+    page = await context.new_page()
+    await page.route("**/*", block_static_assets)
+    print(f"[{label}] Navigating to Streamlit app...")
+    await page.goto(APP_URL, timeout=30000)
+
+    # Wait for app to load
+    await page.wait_for_selector("[data-testid='stApp']", timeout=30000)
+    print(f"[{label}] ✅ App loaded successfully")
+
+    # Wait for sidebar to be visible
+    await page.wait_for_selector("[data-testid='stSidebar']", timeout=10000)
+
+    # Find all input fields in sidebar and set them one by one
+    inputs = await page.locator("[data-testid='stSidebar'] input").all()
+    if len(inputs) >= 3:
+        await inputs[0].fill("2025-08-01")  # Owner Revenue Start
+        await inputs[1].fill("2026-06-30")  # Year 1 End
+        await inputs[2].fill("2025-12-07")  # Current Report Date
+        print(f"[{label}] ✅ Set sidebar dates")
+
+    # Upload qb_export.csv into the first file input (the QB ledger upload)
+    file_inputs = page.locator("input[type='file']")
+    if await file_inputs.count():
+        await file_inputs.first.set_input_files("qb_export.csv")
+        print(f"[{label}] ✅ File uploaded")
+    else:
+        print(f"[{label}] ❌ No file input found")
+
+    # Wait for the first table/metric instead of a fixed sleep
+    await page.wait_for_selector(DATA_READY_SELECTOR, timeout=15000)
+    return page
+
+
+async def open_tab(page, tab_name):
+    """Click the tab labelled ``tab_name``; return False if it cannot be found."""
+    # Snapshot clickable tab candidates in one round-trip instead of
+    # materialising every button/link handle.
+    candidates = await page.evaluate(
+        "(sel) => [...document.querySelectorAll(sel)]"
+        ".map((e, i) => ({i, t: (e.textContent || '').trim()}))",
+        TAB_SELECTOR,
+    )
+    tab_index = {c["t"]: c["i"] for c in candidates if c["t"]}
+
+    # Method 1: buttons, links and ARIA tabs from the snapshot
+    label = tab_name if tab_name in tab_index else next(
+        (t for t in tab_index if tab_name in t), None
+    )
+    if label is not None:
+        print(f"Found tab: {label}")
+        await page.locator(TAB_SELECTOR).filter(has_text=tab_name).first.click()
+        return True
+
+    # Method 2: spans/divs with tab text, filtered in the browser
+    hits = await page.evaluate(
+        "(name) => [...document.querySelectorAll('span, div')]"
+        ".map((n, i) => n.textContent && n.textContent.includes(name) ? i : -1)"
+        ".filter(i => i >= 0)",
+        tab_name,
+    )
+    if hits:
+        elem = page.locator("span, div").nth(hits[0])
+        print(f"Found tab element: {await elem.text_content()}")
+        await elem.click()
+        return True
+    return False
+
+
+async def check_tab(context, tab_name):
+    """Load the app in its own context, open one tab and report its status."""
+    print(f"\n--- Testing Tab: {tab_name} ---")
+    try:
+        page = await load_app_with_ledger(context, tab_name)
+        if not await open_tab(page, tab_name):
+            print(f"⚠️  {tab_name}: Tab element not found")
+            return "TAB_NOT_FOUND"
+
+        # Wait for tab content to load; reruns arrive over the websocket, so
+        # settle on the app root and network idle rather than an HTTP response.
+        await page.locator("[data-testid='stApp']").wait_for(state="attached")
+        await page.wait_for_load_state("networkidle")
+
+        # Check for error elements
+        error_elements = await page.locator(".stException, .streamlit-error, [data-testid='stException']").all()
+        if error_elements:
+            print(f"❌ {tab_name}: Error detected")
+            error_text = await error_elements[0].text_content()
+            print(f"Error preview: {error_text[:200]}...")
+            return f"ERROR: {error_text[:200]}..."  # Truncate long errors
+        print(f"✅ {tab_name}: Loaded successfully")
+        return "OK"
+    except Exception as e:
+        print(f"❌ {tab_name}: Exception - {e}")
+        return f"ERROR: {str(e)}"
+
+
+async def test_streamlit_with_playwright():
+    """Test Streamlit app using Playwright for real browser automation.
+
+    Each tab is checked in its own browser context so the per-tab uploads and
+    renders overlap instead of running one after another.
+    """
 
-def test_streamlit_with_playwright():
-    """Test Streamlit app using Playwright for real browser automation"""
-    
     results = {}
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
-        
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=True, args=["--disable-gpu", "--disable-dev-shm-usage"]
+        )
+        # Reuse cookies/local storage from the last run. The Streamlit session
+        # itself lives on the websocket, so each context still uploads the ledger.
+        state = STATE_PATH if os.path.exists(STATE_PATH) else None
+
         try:
-            print("Navigating to Streamlit app...")
-            page.goto("http://localhost:8501", timeout=30000)
-            
-            # Wait for app to load
-            page.wait_for_selector("[data-testid='stApp']", timeout=30000)
-            print("✅ App loaded successfully")
-            
-            # Set up sidebar parameters - be more flexible with selectors
-            print("Setting up sidebar parameters...")
-            
-            # Wait for sidebar to be visible
-            page.wait_for_selector("[data-testid='stSidebar']", timeout=10000)
-            
-            # Find all input fields in sidebar and set them one by one
-            inputs = page.locator("[data-testid='stSidebar'] input").all()
-            print(f"Found {len(inputs)} input fields in sidebar")
-            
-            if len(inputs) >= 3:
-                # Set Owner Revenue Start (first input)
-                inputs[0].fill("2025-08-01")
-                print("✅ Set Owner Revenue Start")
-                
-                # Set Year 1 End (second input)
-                inputs[1].fill("2026-06-30")
-                print("✅ Set Year 1 End")
-                
-                # Set Current Report Date (third input)
-                inputs[2].fill("2025-12-07")
-                print("✅ Set Current Report Date")
-            
-            # Upload qb_export.csv
-            print("Uploading qb_export.csv...")
-            file_inputs = page.locator("input[type='file']").all()
-            if file_inputs:
-                # Use the first file input (should be the QB ledger upload)
-                file_inputs[0].set_input_files("qb_export.csv")
-                print("✅ File uploaded")
-            else:
-                print("❌ No file input found")
-            
-            # Wait for upload to process and data to load
-            time.sleep(8)
-            print("✅ Waiting for data processing...")
-            
-            # Test main dashboard
+            # Test main dashboard; a timeout here is recorded and the per-tab
+            # checks still run, each in its own context.
             print("Testing main dashboard...")
-            main_content = page.locator("[data-testid='stApp']")
-            if main_content.is_visible():
-                print("✅ Main dashboard loaded")
-                results["main_dashboard"] = "OK"
-            else:
-                print("❌ Main dashboard not visible")
-                results["main_dashboard"] = "ERROR"
-            
-            # Test all tabs - look for tab buttons/links more broadly
-            tabs = [
-                "📈 Forecast & Run Rates",
-                "🔍 Addbacks Analysis", 
-                "📋 Data Inspection",
-                "📑 Project Billing Digital Twin",
-                "📚 Accounts & SDE Tuning",
-                "⚖️ Reconciliation",
-                "📊 KPI Explorer"
-            ]
-            
-            for tab_name in tabs:
-                print(f"\n--- Testing Tab: {tab_name} ---")
-                try:
-                    # Look for tab elements - try multiple approaches
-                    tab_found = False
-                    
-                    # Method 1: Look for buttons with tab text
-                    tab_buttons = page.locator("button").all()
-                    for button in tab_buttons:
-                        if tab_name in button.text_content():
-                            print(f"Found tab button: {button.text_content()}")
-                            button.click()
-                            tab_found = True
-                            break
-                    
-                    # Method 2: Look for links with tab text
-                    if not tab_found:
-                        tab_links = page.locator("a").all()
-                        for link in tab_links:
-                            if tab_name in link.text_content():
-                                print(f"Found tab link: {link.text_content()}")
-                                link.click()
-                                tab_found = True
-                                break
-                    
-                    # Method 3: Look for spans/divs with tab text
-                    if not tab_found:
-                        tab_elements = page.locator("span, div").all()
-                        for elem in tab_elements:
-                            if tab_name in elem.text_content():
-                                print(f"Found tab element: {elem.text_content()}")
-                                elem.click()
-                                tab_found = True
-                                break
-                    
-                    if tab_found:
-                        # Wait for tab content to load
-                        time.sleep(5)
-                        
-                        # Check for error elements
-                        error_elements = page.locator(".stException, .streamlit-error, [data-testid='stException']").all()
-                        if error_elements:
-                            print(f"❌ {tab_name}: Error detected")
-                            error_text = error_elements[0].text_content()
-                            results[tab_name] = f"ERROR: {error_text[:200]}..."  # Truncate long errors
-                            print(f"Error preview: {error_text[:200]}...")
-                        else:
-                            print(f"✅ {tab_name}: Loaded successfully")
-                            results[tab_name] = "OK"
-                    else:
-                        print(f"⚠️  {tab_name}: Tab element not found")
-                        results[tab_name] = "TAB_NOT_FOUND"
-                        
-                except Exception as e:
-                    print(f"❌ {tab_name}: Exception - {e}")
-                    results[tab_name] = f"ERROR: {str(e)}"
-            
+            context = await browser.new_context(storage_state=state)
+            try:
+                page = await load_app_with_ledger(context, "main")
+                if await page.locator("[data-testid='stApp']").is_visible():
+                    print("✅ Main dashboard loaded")
+                    results["main_dashboard"] = "OK"
+                    await context.storage_state(path=STATE_PATH)
+                else:
+                    print("❌ Main dashboard not visible")
+                    results["main_dashboard"] = "ERROR"
+            except PlaywrightTimeoutError as e:
+                print(f"❌ Main dashboard timed out: {e}")
+                results["main_dashboard"] = f"TIMEOUT: {e}"
+            finally:
+                await context.close()
+
+            contexts = await asyncio.gather(*[browser.new_context(storage_state=state) for _ in TABS])
+            statuses = await asyncio.gather(
+                *[check_tab(ctx, name) for ctx, name in zip(contexts, TABS)]
+            )
+            results.update(zip(TABS, statuses))
+
         except Exception as e:
             print(f"❌ Error during testing: {e}")
             results["general_error"] = str(e)
-        
+
         finally:
-            browser.close()
-    
+            await browser.close()
+
     return results
 
 if __name__ == "__main__":
-    results = test_streamlit_with_playwright()
+    results = asyncio.run(test_streamlit_with_playwright())
     print("\n=== Final Results ===")
     for key, value in results.items():
         print(f"{key}: {value}")
-    
+
     # Save results to file
     with open("tab_test_results.json", "w") as f:
         json.dump(results, f, indent=2)
@@ -1,53 +1,35 @@
 import pandas as pd
 import numpy as np
-from datetime import timedelta
-from src.data_loader import load_ledger
-
-def clean_currency(val):
-    if isinstance(val, str):
-        val = val.replace('$', '').replace(',', '').strip()
-        # Handle "- $28800.3" format in bank export
-        if val.startswith('- '):
-            val = '-' + val[2:]
-        elif val.startswith('+ '):
-            val = val[2:]
-        elif val.startswith('(') and val.endswith(')'):
-            val = '-' + val[1:-1]
-    return pd.to_numeric(val, errors='coerce')
+from src.data_loader import NamedBytesIO, load_ledger
+
+# Only these columns of the bank export are used downstream.
+BANK_EXPORT_COLUMNS = ['Transaction Date', 'Transaction Description', 'Amount']
 
 def load_bank_export(path):
     print(f"Loading Bank Export: {path}")
-    df = pd.read_csv(path)
-    # Columns: Transaction Date, Transaction Description, Amount
-    
-    df['amount'] = df['Amount'].apply(clean_currency)
-    df['date'] = pd.to_datetime(df['Transaction Date'], errors='coerce')
+    # Load only the columns we use, as plain strings; Amount carries "$"/"- " markup
+    # that is stripped below, so typed parsing happens after the read.
+    df = pd.read_csv(path, usecols=BANK_EXPORT_COLUMNS, dtype=str)
     
     # Bank Export:
     # - $xx means Money Out (Withdrawal/Check) -> Negative in DataFrame
     # + $xx means Money In (Deposit) -> Positive in DataFrame
-    df['amount'] = pd.to_numeric(df['amount'], errors='coerce').fillna(0.0)
+    # (xx) is also treated as negative.
+    amount = df['Amount'].str.replace(r'[\$,]', '', regex=True).str.strip()
+    amount = (
+        amount.str.replace(r'^\((.*)\)$', r'-\1', regex=True)
+        .str.replace(r'^-\s+', '-', regex=True)
+        .str.replace(r'^\+\s+', '', regex=True)
+    )
+    df['amount'] = pd.to_numeric(amount, errors='coerce').fillna(0.0)
+    df['date'] = pd.to_datetime(df['Transaction Date'], errors='coerce')
     return df
 
 def load_qb_export(path):
     print(f"Loading QB Export: {path}")
     # Use the project's data loader which handles the specific format of the QB export
     # This handles the CSV format correctly
-    with open(path, 'rb') as f:
-        # Mock UploadedFile
-        class UploadedFile:
-            def __init__(self, file_obj, name):
-                self._file = file_obj
-                self.name = name
-            def __getattr__(self, attr):
-                return getattr(self._file, attr)
-            def seek(self, *args):
-                return self._file.seek(*args)
-            def read(self, *args):
-                return self._file.read(*args)
-
-        uploaded = UploadedFile(f, path)
-        df = load_ledger(uploaded)
+    df = load_ledger(NamedBytesIO.from_path(path))
     
     print(f"Total QB rows loaded: {len(df)}")
     print(f"QB Columns: {df.columns.tolist()}")
@@ -69,75 +51,98 @@ def load_qb_export(path):
     print(f"QB Bank Transactions found: {len(df_bank)}")
     return df_bank
 
+def _to_ns(dates):
+    """Timestamps as int64 nanoseconds plus a NaT mask."""
+    values = pd.to_datetime(dates, errors='coerce').to_numpy(dtype='datetime64[ns]')
+    return values.astype('int64'), np.isnat(values)
+
+
+def match_bank_to_qb(bank_amt, bank_ns, bank_ok, qb_amt, qb_ns, qb_ok, window_ns):
+    """Greedy bank-to-QB matching; returns positional (bank_pos, qb_pos).
+
+    Bank rows are visited in order. Each takes the unmatched QB row whose
+    amount is np.isclose(..., atol=0.01) to the bank amount (default rtol, so
+    large amounts allow a few cents) and whose date is closest within
+    ±window_ns; only when no same-sign candidate exists is the QB sign
+    inverted. Ties go to the earlier QB row.
+    """
+    # QB amounts sorted once, so each lookup is a binary search for the
+    # tolerance band followed by the exact isclose test on that band.
+    order = np.argsort(qb_amt, kind='stable')
+    sorted_amt = qb_amt[order]
+    used = ~qb_ok
+    bank_out, qb_out = [], []
+
+    for i in np.flatnonzero(bank_ok).tolist():
+        amt, t = bank_amt[i], bank_ns[i]
+        band = (0.01 + 1e-5 * abs(amt)) * 1.001
+        for target in (amt, -amt):
+            lo = np.searchsorted(sorted_amt, target - band, side='left')
+            hi = np.searchsorted(sorted_amt, target + band, side='right')
+            cand = order[lo:hi]
+            diffs = np.abs(qb_ns[cand] - t)
+            keep = ~used[cand] & np.isclose(qb_amt[cand], target, atol=0.01) & (diffs <= window_ns)
+            if keep.any():
+                cand, diffs = cand[keep], diffs[keep]
+                best = int(cand[diffs == diffs.min()].min())
+                used[best] = True
+                bank_out.append(i)
+                qb_out.append(best)
+                break
+
+    return np.asarray(bank_out, dtype=np.int64), np.asarray(qb_out, dtype=np.int64)
+
+
 def reconcile(bank_df, qb_df):
     print("\n--- Reconciling ---")
     
     # Bank: Date, Amount, Description
     # QB: Date, Amount, Num, Name, Memo
     
-    # We match on Amount and Date (within +/- 5 days)
-    
-    # Add 'matched' flag
-    bank_df['matched'] = False
-    qb_df['matched'] = False
-    
-    matches = []
-    
-    # Iterate through Bank transactions
-    for i, bank_row in bank_df.iterrows():
-        amt = bank_row['amount']
-        date = bank_row['date']
-        
-        if pd.isna(amt) or pd.isna(date):
-            continue
-            
-        # Find potential matches in QB
-        # Same amount, date within buffer
-        # Increased buffer to 14 days to account for check clearing times
-        date_min = date - timedelta(days=14)
-        date_max = date + timedelta(days=14)
-        
-        # QB Amounts might be inverted?
-        # In Bank Export: Payment = Negative.
-        # In QB GL Export for Bank Account: Credit = Negative?
-        # Let's assume signs match first.
-        
-        # Try exact sign match
-        candidates = qb_df[
-            (~qb_df['matched']) & 
-            (np.isclose(qb_df['amount'], amt, atol=0.01)) & 
-            (qb_df['date'] >= date_min) & 
-            (qb_df['date'] <= date_max)
-        ]
-        
-        if candidates.empty:
-            # Try inverted sign
-            candidates = qb_df[
-                (~qb_df['matched']) & 
-                (np.isclose(qb_df['amount'], -amt, atol=0.01)) & 
-                (qb_df['date'] >= date_min) & 
-                (qb_df['date'] <= date_max)
-            ]
-        
-        if not candidates.empty:
-            # Pick best match (closest date)
-            candidates = candidates.copy()
-            candidates['date_diff'] = (candidates['date'] - date).abs()
-            best_match = candidates.sort_values('date_diff').iloc[0]
-            
-            qb_idx = best_match.name
-            qb_df.at[qb_idx, 'matched'] = True
-            bank_df.at[i, 'matched'] = True
-            
-            matches.append({
-                'Bank_Date': date,
-                'Bank_Desc': bank_row['Transaction Description'],
-                'Amount': amt,
-                'QB_Date': best_match['date'],
-                'QB_Name': best_match['name'] if 'name' in best_match else '',
-                'QB_Num': best_match['num'] if 'num' in best_match else ''
-            })
-            
+    # Match on Amount and Date within +/- 14 days (check clearing times).
+    # Bank export payments are negative; QB may carry either sign, so the
+    # inverted sign is tried per bank row when the same sign finds nothing.
+    window_ns = np.int64(pd.Timedelta(days=14).value)
+    bank_amt = pd.to_numeric(bank_df['amount'], errors='coerce').to_numpy(dtype=float)
+    bank_ns, bank_nat = _to_ns(bank_df['date'])
+    qb_amt = pd.to_numeric(qb_df['amount'], errors='coerce').to_numpy(dtype=float)
+    qb_ns, qb_nat = _to_ns(qb_df['date'])
+
+    bank_pos, qb_pos = match_bank_to_qb(
+        bank_amt, bank_ns, ~(np.isnan(bank_amt) | bank_nat),
+        qb_amt, qb_ns, ~(np.isnan(qb_amt) | qb_nat),
+        window_ns,
+    )
+
+    bank_matched = np.zeros(len(bank_df), dtype=bool)
+    bank_matched[bank_pos] = True
+    qb_matched = np.zeros(len(qb_df), dtype=bool)
+    qb_matched[qb_pos] = True
+    bank_df['matched'] = bank_matched
+    qb_df['matched'] = qb_matched
+
+    bank_hit = bank_df.iloc[bank_pos]
+    qb_hit = qb_df.iloc[qb_pos]
+    blank = [''] * len(qb_pos)
+    matches = [
+        {
+            'Bank_Date': b_date,
+            'Bank_Desc': b_desc,
+            'Amount': amt,
+            'QB_Date': q_date,
+            'QB_Name': q_name,
+            'QB_Num': q_num,
+        }
+        for b_date, b_desc, amt, q_date, q_name, q_num in zip(
+            bank_hit['date'].tolist(),
+            bank_hit['Transaction Description'].tolist(),
+            bank_hit['amount'].tolist(),
+            qb_hit['date'].tolist(),
+            qb_hit['name'].tolist() if 'name' in qb_hit.columns else blank,
+            qb_hit['num'].tolist() if 'num' in qb_hit.columns else blank,
+        )
+    ]
+
     print(f"Matched {len(matches)} transactions.")
     
     # Unmatched Bank
@@ -0,0 +1,55 @@
+"""Helpers shared by the Playwright UAT scripts."""
+
+import asyncio
+import gzip
+import os
+import sys
+from pathlib import Path
+
+# Set PW_CDP_URL (e.g. http://localhost:9222) to drive an already-running
+# Chromium instead of cold-launching one per script.
+PW_CDP_URL = os.getenv("PW_CDP_URL")
+PW_TIMEOUT_S = 60  # cap on any single Playwright call
+
+
+async def _pw(coro, action, t=PW_TIMEOUT_S):
+    """Await a Playwright call with a hard cap so a stalled transport can't hang CI."""
+    try:
+        return await asyncio.wait_for(coro, timeout=t)
+    except asyncio.TimeoutError:
+        print(f"Playwright call stalled after {t}s: {action}", file=sys.stderr)
+        raise
+
+
+async def open_browser(p):
+    if PW_CDP_URL:
+        return await p.chromium.connect_over_cdp(PW_CDP_URL)
+    return await p.chromium.launch(headless=True)
+
+
+# Only the DOM is under test; skip downloading images, fonts and media.
+# Stylesheets still load because visibility checks depend on them.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+
+async def block_static_assets(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def ledger_upload(path: Path) -> dict:
+    """Gzipped in-memory upload payload for ``path``; the app unpacks ``.csv.gz``.
+
+    CSV exports compress well, so the upload sent through the browser and
+    Streamlit's uploader is much smaller than the raw file.
+    """
+    data = path.read_bytes()
+    if path.suffix != ".gz":
+        data = gzip.compress(data, compresslevel=6)
+    return {
+        "name": path.name if path.suffix == ".gz" else path.name + ".gz",
+        "mimeType": "application/gzip",
+        "buffer": data,
+    }
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Compute cost-plus invoices for one billing period from a green-sheet export.
+
+Each --job is given as NAME:OVERHEAD_PCT:PROFIT_PCT with decimal fractions,
+e.g. --job Howard:0.10:0.05. The normalized green sheet is cached under the
+repo's cache/ directory (see load_green_sheets_from_path), so re-running for
+another period or job set skips parsing an unchanged sheet.
+"""
+
+import argparse
+import datetime as dt
+import json
+import sys
+from pathlib import Path
+
+# Ensure repo root is on sys.path so `src.*` imports work when running as a script.
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.billing import JobBillingConfig, compute_period_billing, load_green_sheets_from_path
+
+
+GREEN_SHEETS_CACHE_DIR = _REPO_ROOT / "cache"
+
+
+def parse_job(spec: str) -> JobBillingConfig:
+    """Parse NAME:OVERHEAD_PCT:PROFIT_PCT into a JobBillingConfig."""
+    job, overhead_pct, profit_pct = spec.rsplit(":", 2)
+    return JobBillingConfig(job=job, overhead_pct=float(overhead_pct), profit_pct=float(profit_pct))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute period invoices from a green-sheet export')
+    parser.add_argument('green_sheet', help='Path to green-sheet CSV/XLSX file')
+    parser.add_argument('--job', action='append', required=True, help='NAME:OVERHEAD_PCT:PROFIT_PCT (repeatable)')
+    parser.add_argument('--period-start', required=True, help='Period start date (YYYY-MM-DD)')
+    parser.add_argument('--period-end', required=True, help='Period end date, inclusive (YYYY-MM-DD)')
+    parser.add_argument('--no-cache', action='store_true', help='Parse the sheet without the pickle cache')
+    parser.add_argument('--output', '-o', help='Output JSON file path (default: stdout)')
+
+    args = parser.parse_args()
+
+    period_start = dt.datetime.strptime(args.period_start, '%Y-%m-%d').date()
+    period_end = dt.datetime.strptime(args.period_end, '%Y-%m-%d').date()
+
+    try:
+        job_configs = [parse_job(spec) for spec in args.job]
+        gs = load_green_sheets_from_path(
+            Path(args.green_sheet), cache_dir=None if args.no_cache else GREEN_SHEETS_CACHE_DIR
+        )
+        invoices = compute_period_billing(gs, job_configs, period_start, period_end)
+        result = invoices.to_dict(orient='records')
+
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(result, f, indent=2)
+            print(f"Billing results written to {args.output}")
+        else:
+            print(json.dumps(result, indent=2))
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -13,6 +13,7 @@ Matches the same math used by get_owner_metrics() and calculate_run_rates().
 
 import argparse
 import json
+import numpy as np
 import pandas as pd
 import datetime as dt
 from typing import Dict, Any
@@ -25,22 +26,33 @@ _REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
-from src.business_logic import classify_transactions, detect_addbacks, _net_to_positive
+from src.business_logic import classify_transactions, detect_addbacks, _addback_total
 from src.data_loader import parse_date_series
 
 
+# Export columns used by the KPI math; anything else in the report is skipped at parse time.
+TRANSACTION_DETAIL_COLUMNS = (
+    'Type', 'Date', 'Name', 'Memo', 'Account', 'Class', 'Amount', 'Account Type'
+)
+
+
 def load_transaction_detail(file_path: str) -> pd.DataFrame:
     """Load and clean QB Transaction Detail export."""
     try:
-        # Read CSV, skip the date range summary row
-        df = pd.read_csv(file_path)
-        
-        # Drop the summary row (usually row 1 with date range)
-        df = df.dropna(subset=['Type']).copy()
+        # Read CSV, skip the date range summary row. Headers may carry stray
+        # whitespace, so match them stripped.
+        df = pd.read_csv(
+            file_path,
+            usecols=lambda c: c.strip() in TRANSACTION_DETAIL_COLUMNS,
+        )
         
         # Clean column names (remove leading/trailing spaces, handle unicode)
+        # before anything looks columns up by name
         df.columns = df.columns.str.strip()
         
+        # Drop the summary row (usually row 1 with date range)
+        df = df.dropna(subset=['Type']).copy()
+        
         # Standardize column names to match expected format
         column_mapping = {
             'Date': 'date',
@@ -52,9 +64,7 @@ def load_transaction_detail(file_path: str) -> pd.DataFrame:
             'Account Type': 'account_type'
         }
         
-        for old_col, new_col in column_mapping.items():
-            if old_col in df.columns:
-                df[new_col] = df[old_col]
+        df.rename(columns=column_mapping, inplace=True)
         
         # Parse date column
         if 'date' in df.columns:
@@ -68,10 +78,13 @@ def load_transaction_detail(file_path: str) -> pd.DataFrame:
         else:
             raise ValueError("No amount column found in transaction detail")
             
-        # Fill NaN values in text columns
+        # Fill NaN values in text columns; the repetitive account/class
+        # labels are stored as categoricals, free-text name/memo as strings
         for col in ['name', 'memo', 'account', 'class', 'account_type']:
             if col in df.columns:
                 df[col] = df[col].fillna('').astype(str)
+                if col in ('account', 'class', 'account_type'):
+                    df[col] = df[col].astype('category')
         
         return df
         
@@ -85,7 +98,7 @@ def compute_period_kpis(df: pd.DataFrame, start_date: dt.date, end_date: dt.date
     Compute KPIs for a given period.
     
     Args:
-        df: Transaction detail dataframe
+        df: Transaction detail dataframe, optionally already classified
         start_date: Period start date  
         end_date: Period end date
         revenue_start: When to start counting revenue (for July nuance)
@@ -93,8 +106,14 @@ def compute_period_kpis(df: pd.DataFrame, start_date: dt.date, end_date: dt.date
     if revenue_start is None:
         revenue_start = start_date
         
+    # Day-resolution bounds; NaT compares False against all of them
+    start_day = np.datetime64(start_date, 'D')
+    end_day = np.datetime64(end_date, 'D')
+    revenue_day = np.datetime64(revenue_start, 'D')
+
     # Filter to period
-    mask_period = (df['date'].dt.date >= start_date) & (df['date'].dt.date <= end_date)
+    days = df['date'].to_numpy(dtype='datetime64[D]')
+    mask_period = (days >= start_day) & (days <= end_day)
     df_period = df[mask_period].copy()
     
     if len(df_period) == 0:
@@ -110,40 +129,45 @@ def compute_period_kpis(df: pd.DataFrame, start_date: dt.date, end_date: dt.date
             'gross_profit': 0.0
         }
     
-    # Classify transactions
-    df_period = classify_transactions(df_period)
-    df_period = detect_addbacks(df_period)
+    # Classify transactions (main() classifies the full export once up front)
+    if 'classification' not in df_period.columns:
+        df_period = classify_transactions(df_period)
+    if 'sde_addback_flag' not in df_period.columns:
+        df_period = detect_addbacks(df_period)
+    
+    days = df_period['date'].to_numpy(dtype='datetime64[D]')
+    owner_days = days >= revenue_day
+
+    # One weighted pass over amounts, bucketed by kind (revenue, COGS, overhead,
+    # other expense, none) and by whether the row falls on/after revenue_start.
+    kind = np.select(
+        [df_period['is_revenue'], df_period['is_cogs'], df_period['is_overhead'], df_period['is_other_expense']],
+        [0, 1, 2, 3],
+        default=4,
+    )
+    amounts = df_period['amount'].fillna(0.0).to_numpy(dtype=float)
+    sums = np.bincount(kind * 2 + owner_days, weights=amounts, minlength=10).reshape(5, 2)
     
     # Revenue (only count from revenue_start forward)
-    rev_mask = df_period['is_revenue'] & (df_period['date'].dt.date >= revenue_start)
-    revenue_raw = df_period.loc[rev_mask, 'amount'].sum()
-    revenue = _net_to_positive(revenue_raw)
+    revenue = abs(float(sums[0, 1]))
     
     # COGS with July nuance
     # Owner COGS: revenue_start forward
-    cogs_owner_mask = df_period['is_cogs'] & (df_period['date'].dt.date >= revenue_start)
-    cogs_raw = df_period.loc[cogs_owner_mask, 'amount'].sum()
-    cogs = _net_to_positive(cogs_raw)
+    cogs = abs(float(sums[1, 1]))
     
     # Legacy COGS: before revenue_start (typically July)
-    cogs_legacy_mask = df_period['is_cogs'] & (df_period['date'].dt.date >= start_date) & (df_period['date'].dt.date < revenue_start)
-    legacy_cogs_raw = df_period.loc[cogs_legacy_mask, 'amount'].sum()
-    legacy_cogs = _net_to_positive(legacy_cogs_raw)
+    legacy_cogs = abs(float(sums[1, 0]))
     
     # Overhead and other expenses (include all period)
-    overhead_raw = df_period.loc[df_period['is_overhead'], 'amount'].sum()
-    overhead = _net_to_positive(overhead_raw)
-    
-    other_expense_raw = df_period.loc[df_period['is_other_expense'], 'amount'].sum() 
-    other_expense = _net_to_positive(other_expense_raw)
+    overhead = abs(float(sums[2].sum()))
+    other_expense = abs(float(sums[3].sum()))
     
     # Addbacks
-    addback_mask = df_period.get('sde_addback_flag', pd.Series([False] * len(df_period)))
-    addback_series = df_period.loc[addback_mask, 'amount']
-    if (addback_series > 0).any():
-        addbacks = float(addback_series[addback_series > 0].sum())
+    if 'sde_addback_flag' in df_period.columns:
+        addback_mask = df_period['sde_addback_flag'].to_numpy(dtype=bool)
     else:
-        addbacks = float(-addback_series[addback_series < 0].sum())
+        addback_mask = np.zeros(len(df_period), dtype=bool)
+    addbacks = _addback_total(df_period['amount'].to_numpy(dtype=float)[addback_mask])
     
     # Calculate metrics
     gross_profit = revenue - cogs
@@ -186,6 +210,10 @@ def main():
         # Load transaction detail
         df = load_transaction_detail(args.transaction_file)
         
+        # Classification is row-wise, so do it once for both (overlapping) periods
+        df = classify_transactions(df)
+        df = detect_addbacks(df)
+        
         # Compute owner period KPIs (7/1 → current)
         owner_kpis = compute_period_kpis(
             df, 
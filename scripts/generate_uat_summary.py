@@ -5,27 +5,35 @@ from pathlib import Path
 from typing import Any
 
 
-_WINDOWS_ABS_PATH_RE = re.compile(r"[A-Za-z]:\\\\[^\s\"']+")
-_UNC_PATH_RE = re.compile(r"\\\\\\\\[A-Za-z0-9_.-]+\\\\[^\s\"']+")
-_URL_RE = re.compile(r"https?://[^\s\"']+")
+_PATH_PATTERN = r"[A-Za-z]:\\\\[^\s\"']+|\\\\\\\\[A-Za-z0-9_.-]+\\\\[^\s\"']+"
+_URL_PATTERN = r"https?://[^\s\"']+"
+# Best-effort scrub for common ID-like markers; the value may itself be a path
+_ID_PATTERN = rf"(?i:\b(?:file[_-]?id|widget[_-]?id)\b\s*[:=]\s*(?:{_PATH_PATTERN}|[^\s,;]+))"
 
+# Windows/UNC paths, URLs and ID markers in one left-to-right pass
+_SCRUB_RE = re.compile(rf"(?P<path>{_PATH_PATTERN})|(?P<url>{_URL_PATTERN})|(?P<id>{_ID_PATTERN})")
+# Kept URLs can still carry a path or ID marker in their query string
+_URL_BODY_RE = re.compile(rf"(?P<path>{_PATH_PATTERN})|(?P<id>{_ID_PATTERN})")
+
+_SENSITIVE_KEY_RE = re.compile("absolute_path|upload_url|file_id|widget_id|username|machine|hostname")
 
-def _scrub_string(value: str) -> str:
-    value = _WINDOWS_ABS_PATH_RE.sub("<REDACTED_PATH>", value)
-    value = _UNC_PATH_RE.sub("<REDACTED_PATH>", value)
 
-    def _url_repl(match: re.Match[str]) -> str:
-        url = match.group(0)
-        lower = url.lower()
-        if "streamlit" in lower or "upload" in lower:
-            return "<REDACTED_URL>"
-        return "<REDACTED_URL>" if "file_id=" in lower or "widget" in lower else url
+def _scrub_match(match: re.Match[str]) -> str:
+    kind = match.lastgroup
+    if kind == "path":
+        return "<REDACTED_PATH>"
+    if kind == "id":
+        return "<REDACTED_ID>"
 
-    value = _URL_RE.sub(_url_repl, value)
+    url = match.group(0)
+    lower = url.lower()
+    if "streamlit" in lower or "upload" in lower or "file_id=" in lower or "widget" in lower:
+        return "<REDACTED_URL>"
+    return _URL_BODY_RE.sub(_scrub_match, url)
 
-    # Best-effort scrub for common ID-like markers
-    value = re.sub(r"\b(file[_-]?id|widget[_-]?id)\b\s*[:=]\s*[^\s,;]+", "<REDACTED_ID>", value, flags=re.IGNORECASE)
-    return value
+
+def _scrub_string(value: str) -> str:
+    return _SCRUB_RE.sub(_scrub_match, value)
 
 
 def scrub(obj: Any) -> Any:
@@ -36,8 +44,7 @@ def scrub(obj: Any) -> Any:
     if isinstance(obj, dict):
         scrubbed: dict[str, Any] = {}
         for key, value in obj.items():
-            key_lower = str(key).lower()
-            if any(token in key_lower for token in ["absolute_path", "upload_url", "file_id", "widget_id", "username", "machine", "hostname"]):
+            if _SENSITIVE_KEY_RE.search(str(key).lower()):
                 continue
             scrubbed[str(key)] = scrub(value)
         return scrubbed
@@ -87,7 +94,8 @@ def main() -> int:
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    run_summary = json.loads(input_path.read_text(encoding="utf-8-sig"))
+    # json.loads sniffs the encoding (BOM included) from raw bytes, skipping a str copy
+    run_summary = json.loads(input_path.read_bytes())
     sanitized = build_sanitized_summary(run_summary)
     output_path.write_text(json.dumps(sanitized, indent=2, sort_keys=True) + "\n", encoding="utf-8")
     return 0
@@ -1,11 +1,14 @@
 import asyncio
 import json
 import os
+import random
 import sys
 from pathlib import Path
 
 from playwright.async_api import async_playwright
 
+from _uat_common import block_static_assets, ledger_upload, open_browser
+
 
 def append_debug(url: str, debug: bool) -> str:
     if not debug:
@@ -17,12 +20,35 @@ RAW_URL = os.getenv("APP_URL", "http://localhost:8501")
 LEDGER_PATH = Path(os.getenv("LEDGER_PATH", "qb_export.csv"))
 
 
+DATA_READY_SELECTOR = "[data-testid='stMetric'], [data-testid='stDataFrame']"
+
+
+async def wait_ready(page, total: float = 15.0) -> bool:
+    """Poll for rendered ledger output with jittered exponential backoff.
+
+    Checks at roughly 0.25s, 0.5s, 1s, 2s, 4s, ... until ``total`` seconds have
+    elapsed; returns False if nothing rendered in time.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + total
+    delay = 0.25
+    while True:
+        if await page.query_selector(DATA_READY_SELECTOR) is not None:
+            return True
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(random.uniform(delay, delay * 1.25), remaining))
+        delay *= 2
+
+
 async def main():
     url_no_debug = append_debug(RAW_URL, debug=False)
 
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
+        browser = await open_browser(p)
         page = await browser.new_page()
+        await page.route("**/*", block_static_assets)
 
         await page.goto(url_no_debug, wait_until="networkidle")
 
@@ -32,8 +58,10 @@ async def main():
             await browser.close()
             sys.exit(1)
 
-        await page.locator('input[type="file"]').first.set_input_files(str(LEDGER_PATH))
-        await page.wait_for_timeout(8000)
+        await page.locator('input[type="file"]').first.set_input_files(ledger_upload(LEDGER_PATH))
+        # Continue as soon as the ledger has rendered; on timeout still scan the body.
+        if await wait_ready(page):
+            await page.wait_for_load_state("networkidle")
 
         body = await page.inner_text("body")
 
@@ -4,30 +4,53 @@ from pathlib import Path
 
 from playwright.async_api import async_playwright
 
-APP_URL = "http://localhost:8502"
+from _uat_common import _pw, ledger_upload, open_browser
+
+APP_URL = "http://localhost:8502/?debug=1"  # debug=1 renders the TAB_OK:: markers
 LEDGER_PATH = Path("qb_export.csv")
+TAB_TIMEOUT_S = 60  # per-tab cap: fresh session, upload, click and render
+
+# Tab label -> key of the TAB_OK::<key> caption app.py renders in debug mode
+TAB_MARKERS = {
+    "Overview": "OVERVIEW",
+    "Addbacks": "ADDBACKS",
+    "Reconciliation": "RECONCILIATION",
+}
+
+
+async def wait_for_marker(page, tab_name, timeout=5000):
+    """Wait until the tab's TAB_OK marker renders; False if it never shows."""
+    key = TAB_MARKERS.get(tab_name)
+    if key is None:
+        return False
+    try:
+        await _pw(page.wait_for_selector(f"text=TAB_OK::{key}", timeout=timeout), f"wait for TAB_OK::{key}")
+        return True
+    except Exception:
+        return False
+
 
 async def test_tab(page, tab_name, tab_selector):
     """Test a specific tab and capture any errors"""
     print(f"\n=== Testing {tab_name} ===")
     try:
-        # Click the tab
-        await page.click(tab_selector)
-        await page.wait_for_timeout(3000)  # Wait for rendering
+        # Click the tab, then continue as soon as it has rendered
+        await _pw(page.click(tab_selector), f"click {tab_selector}")
+        await wait_for_marker(page, tab_name)
         
         # Check for error elements
-        error_elements = await page.locator('[data-testid="stException"]').count()
-        red_boxes = await page.locator('.stException').count()
+        error_elements = await _pw(page.locator('[data-testid="stException"]').count(), "count exception blocks")
+        red_boxes = await _pw(page.locator('.stException').count(), "count exception blocks")
         
         if error_elements > 0 or red_boxes > 0:
             print(f"❌ {tab_name}: ERROR DETECTED")
             # Try to get error details
             try:
-                error_text = await page.locator('[data-testid="stException"]').inner_text()
+                error_text = await _pw(page.locator('[data-testid="stException"]').inner_text(), "read exception text")
                 print(f"Error content: {error_text}")
             except:
                 try:
-                    error_text = await page.locator('.stException').inner_text()
+                    error_text = await _pw(page.locator('.stException').inner_text(), "read exception text")
                     print(f"Error content: {error_text}")
                 except:
                     print("Could not extract error text")
@@ -39,57 +62,86 @@ async def test_tab(page, tab_name, tab_selector):
         print(f"❌ {tab_name}: EXCEPTION - {e}")
         return f"EXCEPTION: {e}"
 
+async def test_tab_in_new_context(browser, tab_name, tab_selector):
+    """Test one tab in its own browser session with the ledger uploaded."""
+    # Streamlit keeps the upload in the websocket session, so each context re-uploads.
+    context = await _pw(browser.new_context(), "browser.new_context()")
+    try:
+        page = await _pw(context.new_page(), "context.new_page()")
+        page.set_default_timeout(5000)
+        page.set_default_navigation_timeout(30000)
+        await _pw(page.goto(APP_URL, wait_until="networkidle"), "page.goto()")
+        await _pw(page.locator('input[type="file"]').first.set_input_files(ledger_upload(LEDGER_PATH)), "upload ledger")
+        await _pw(page.wait_for_selector("text=UAT_METRICS_START", timeout=30000), "wait for UAT_METRICS_START")
+        return await test_tab(page, tab_name, tab_selector)
+    finally:
+        await _pw(context.close(), "context.close()")
+
+
+async def guarded_test_tab(browser, tab_name, tab_selector):
+    """Run test_tab_in_new_context with an overall time cap."""
+    try:
+        return await asyncio.wait_for(
+            test_tab_in_new_context(browser, tab_name, tab_selector), timeout=TAB_TIMEOUT_S
+        )
+    except asyncio.TimeoutError:
+        print(f"❌ {tab_name}: timed out after {TAB_TIMEOUT_S}s")
+        return f"EXCEPTION: timed out after {TAB_TIMEOUT_S}s"
+    except Exception as e:
+        print(f"❌ {tab_name}: EXCEPTION - {e}")
+        return f"EXCEPTION: {e}"
+
+
 async def main():
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+        browser = await _pw(open_browser(p), "open browser")
+        page = await _pw(browser.new_page(), "browser.new_page()")
+        page.set_default_timeout(5000)
+        page.set_default_navigation_timeout(30000)
 
         # 1. Go to app
         print(f"Navigating to {APP_URL}")
-        await page.goto(APP_URL, wait_until="networkidle")
+        await _pw(page.goto(APP_URL, wait_until="networkidle"), "page.goto()")
 
         # 2. Upload ledger file
         print(f"Uploading {LEDGER_PATH}")
         file_input = page.locator('input[type="file"]').first
         if not LEDGER_PATH.exists():
             print(f"❌ Ledger file not found: {LEDGER_PATH}")
-            await browser.close()
+            await _pw(browser.close(), "browser.close()")
             return
 
-        await file_input.set_input_files(str(LEDGER_PATH))
+        await _pw(file_input.set_input_files(ledger_upload(LEDGER_PATH)), "upload ledger")
 
         # Wait for processing
         print("Waiting for ledger processing...")
-        await page.wait_for_timeout(8000)
+        try:
+            await _pw(page.wait_for_selector("text=UAT_METRICS_START", timeout=30000), "wait for UAT_METRICS_START")
+        except Exception:
+            print("ℹ️  UAT metrics marker not seen; checking for errors anyway")
 
         # Check for processing errors
-        error_elements = await page.locator('[data-testid="stException"]').count()
+        error_elements = await _pw(page.locator('[data-testid="stException"]').count(), "count exception blocks")
         if error_elements > 0:
             print("❌ Top-level processing error detected")
             try:
-                error_text = await page.locator('[data-testid="stException"]').inner_text()
+                error_text = await _pw(page.locator('[data-testid="stException"]').inner_text(), "read exception text")
                 print(f"Processing error: {error_text}")
             except:
                 print("Could not extract processing error text")
-            await browser.close()
+            await _pw(browser.close(), "browser.close()")
             return
 
         print("✅ Ledger processed successfully")
 
         # 3. Test each tab
-        tabs_to_test = [
-            ("📈 Forecast & Run Rates", "text=📈 Forecast & Run Rates"),
-            ("🔍 Addbacks Analysis", "text=🔍 Addbacks Analysis"),
-            ("📋 Data Inspection", "text=📋 Data Inspection"),
-            ("📑 Project Billing Digital Twin", "text=📑 Project Billing Digital Twin"),
-            ("📚 Accounts & SDE Tuning", "text=📚 Accounts & SDE Tuning"),
-            ("⚖️ Reconciliation", "text=⚖️ Reconciliation"),
-            ("📊 KPI Explorer", "text=📊 KPI Explorer"),
-        ]
-
-        results = {}
-        for tab_name, tab_selector in tabs_to_test:
-            results[tab_name] = await test_tab(page, tab_name, tab_selector)
+        tabs_to_test = [(name, f"[role='tab']:has-text('{name}')") for name in TAB_MARKERS]
+
+        # Tabs are independent once the ledger is loaded, so check them concurrently
+        statuses = await asyncio.gather(
+            *[guarded_test_tab(browser, name, sel) for name, sel in tabs_to_test]
+        )
+        results = {name: status for (name, _), status in zip(tabs_to_test, statuses)}
 
         # 4. Summary
         print("\n" + "="*50)
@@ -99,33 +151,15 @@ async def main():
             status_icon = "✅" if status == "OK" else "❌"
             print(f"{status_icon} {tab_name}: {status}")
 
-        # 5. Test special functionality for Billing tab
-        print(f"\n=== Testing Billing Digital Twin Upload ===")
-        try:
-            await page.click("text=📑 Project Billing Digital Twin")
-            await page.wait_for_timeout(2000)
-            
-            # Try to find file upload for green sheets
-            green_sheet_upload = page.locator('input[type="file"]').nth(1)  # Second file input
-            upload_count = await green_sheet_upload.count()
-            
-            if upload_count > 0:
-                print("✅ Green sheet upload field found")
-                # Note: We don't have a green sheet file to test with
-            else:
-                print("ℹ️  Green sheet upload field not found or not visible")
-        except Exception as e:
-            print(f"❌ Billing tab upload test failed: {e}")
-
-        # 6. Test Reconciliation tab
+        # 5. Test Reconciliation tab
         print(f"\n=== Testing Reconciliation Upload ===")
         try:
-            await page.click("text=⚖️ Reconciliation")
-            await page.wait_for_timeout(2000)
+            await _pw(page.click("[role='tab']:has-text('Reconciliation')"), "click reconciliation tab")
+            await wait_for_marker(page, "Reconciliation")
             
             # Try to find bank file upload
             bank_upload = page.locator('input[type="file"]').nth(1)  # Second file input
-            upload_count = await bank_upload.count()
+            upload_count = await _pw(bank_upload.count(), "bank_upload.count()")
             
             if upload_count > 0:
                 print("✅ Bank file upload field found")
@@ -134,7 +168,7 @@ async def main():
         except Exception as e:
             print(f"❌ Reconciliation tab upload test failed: {e}")
 
-        await browser.close()
+        await _pw(browser.close(), "browser.close()")
 
         # Final result
         result = {
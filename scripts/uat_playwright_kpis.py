@@ -6,40 +6,62 @@ from pathlib import Path
 
 from playwright.async_api import async_playwright
 
+from _uat_common import PW_TIMEOUT_S, _pw, ledger_upload, open_browser
+
 
 _raw_url = os.getenv("APP_URL", "http://localhost:8501")
 APP_URL = _raw_url if "debug=1" in _raw_url else (_raw_url + ("&" if "?" in _raw_url else "?") + "debug=1")
 LEDGER_PATH = Path(os.getenv("LEDGER_PATH", "qb_export.csv"))
 
 
+async def wait_for_uat_block(page, total=30.0):
+    """Poll the rendered code blocks until both UAT markers are present.
+
+    The metrics are emitted via st.code, so only <pre>/<code> text is read.
+    Polls every 250ms, backing off to 2s, for at most ``total`` seconds.
+    Returns the last text seen (empty markers mean the block never rendered).
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + total
+    interval = 0.25
+    text = ""
+    while True:
+        text = "\n".join(await _pw(page.locator("pre, code").all_inner_texts(), "read code blocks"))
+        if "UAT_METRICS_START" in text and "UAT_METRICS_END" in text:
+            return text
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return text
+        await asyncio.sleep(min(interval, remaining))
+        interval = min(interval * 1.5, 2.0)
+
+
 async def main():
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+        browser = await _pw(open_browser(p), "open browser")
+        page = await _pw(browser.new_page(), "browser.new_page()")
 
         # 1. Go to app
-        await page.goto(APP_URL, wait_until="networkidle")
+        await _pw(page.goto(APP_URL, wait_until="networkidle"), "page.goto()")
 
         # 2. Upload ledger file
         # Find the first file input on the page (Streamlit's uploader)
         file_input = page.locator('input[type="file"]').first
         if not LEDGER_PATH.exists():
             print(json.dumps({"error": f"Ledger file not found: {LEDGER_PATH}"}))
-            await browser.close()
+            await _pw(browser.close(), "browser.close()")
             sys.exit(1)
 
-        await file_input.set_input_files(str(LEDGER_PATH))
+        await _pw(file_input.set_input_files(ledger_upload(LEDGER_PATH)), "upload ledger")
 
         # 3. Wait for our UAT block to appear
-        # Give Streamlit time to process the file and render the code block
-        await page.wait_for_timeout(8000)  # crude but robust
-
-        body_text = await page.inner_text("body")
+        body_text = await wait_for_uat_block(page)
 
         start_idx = body_text.find("UAT_METRICS_START")
         end_idx = body_text.find("UAT_METRICS_END")
 
         if start_idx == -1 or end_idx == -1:
+            body_text = await _pw(page.inner_text("body"), "read page body")
             result = {
                 "url": APP_URL,
                 "ledger_file": str(LEDGER_PATH),
@@ -47,7 +69,7 @@ async def main():
                 "raw_excerpt": body_text[-2000:],  # last part of page for debugging
             }
             print(json.dumps(result, indent=2))
-            await browser.close()
+            await _pw(browser.close(), "browser.close()")
             sys.exit(1)
 
         # Extract the JSON substring
@@ -64,7 +86,7 @@ async def main():
                 "raw_block": marker_block,
             }
             print(json.dumps(result, indent=2))
-            await browser.close()
+            await _pw(browser.close(), "browser.close()")
             sys.exit(1)
 
         json_str = marker_block[json_start:json_end]
@@ -80,7 +102,7 @@ async def main():
                 "json_str": json_str,
             }
             print(json.dumps(result, indent=2))
-            await browser.close()
+            await _pw(browser.close(), "browser.close()")
             sys.exit(1)
 
         # Final UAT output
@@ -91,9 +113,17 @@ async def main():
         }
         print(json.dumps(result, indent=2))
 
-        await browser.close()
+        await _pw(browser.close(), "browser.close()")
         sys.exit(0)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    except asyncio.TimeoutError:
+        print(json.dumps({
+            "url": APP_URL,
+            "ledger_file": str(LEDGER_PATH),
+            "error": f"Playwright call exceeded {PW_TIMEOUT_S}s (see stderr)",
+        }, indent=2))
+        sys.exit(1)
@@ -2,6 +2,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Literal
 
+import numpy as np
 import pandas as pd
 
 Classification = Literal["revenue", "cogs", "overhead", "other"]
@@ -49,13 +50,24 @@ def build_account_summary(
 
     # group by account + account_type
     grouped = (
-        df.groupby(["account", "account_type"], dropna=False)["amount"]
+        df.groupby(["account", "account_type"], dropna=False, observed=True)["amount"]
         .sum()
         .reset_index()
     )
 
-    grouped["classification"] = grouped.apply(classify_row, axis=1)
+    # Vectorized classify_row: first matching condition wins
+    atype = grouped["account_type"].astype(str).str.lower()
+    grouped["classification"] = np.select(
+        [
+            atype.str.contains("income|revenue"),
+            atype.str.contains("cost of goods sold", regex=False),
+            atype.str.contains("other expense", regex=False),
+            atype.str.contains("expense|overhead"),
+        ],
+        ["revenue", "cogs", "other", "overhead"],
+        default="other",
+    )
     grouped["ytd_amount"] = grouped["amount"].astype(float)
-    grouped["is_addback"] = grouped["account"].astype(str).isin(addback_accounts)
+    grouped["is_addback"] = grouped["account"].astype(str).isin(frozenset(map(str, addback_accounts)))
 
     return grouped[["account", "account_type", "classification", "ytd_amount", "is_addback"]]
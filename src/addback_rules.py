@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import datetime as dt
+import functools
 import json
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterable
 
+import numpy as np
 import pandas as pd
 
 
@@ -83,20 +85,28 @@ def default_rules() -> list[AddbackRule]:
     ]
 
 
+@functools.lru_cache(maxsize=8)
+def _load_rules_cached(path_str: str, mtime_ns: int, size: int) -> tuple[AddbackRule, ...]:
+    # mtime_ns/size only key the cache so an edited file is re-parsed
+    data = json.loads(Path(path_str).read_text(encoding="utf-8"))
+    if not isinstance(data, list):
+        raise ValueError("addback rules JSON must be a list")
+
+    return tuple(parse_rule(obj) for obj in data if isinstance(obj, dict))
+
+
 def load_rules(path: Path) -> list[AddbackRule]:
+    """Load rules from JSON, re-parsing only when the file changes.
+
+    Streamlit reruns the app on every interaction; the parsed rules are
+    cached on the file's (path, mtime, size), so app.py can call this on
+    every rerun.
+    """
     if not path.exists():
         return []
 
-    data = json.loads(path.read_text(encoding="utf-8"))
-    if not isinstance(data, list):
-        raise ValueError("addback rules JSON must be a list")
-
-    rules: list[AddbackRule] = []
-    for obj in data:
-        if not isinstance(obj, dict):
-            continue
-        rules.append(parse_rule(obj))
-    return rules
+    st = path.stat()
+    return list(_load_rules_cached(str(path), st.st_mtime_ns, st.st_size))
 
 
 def rules_to_jsonable(rules: Iterable[AddbackRule]) -> list[dict[str, Any]]:
@@ -121,17 +131,56 @@ def save_rules(path: Path, rules: Iterable[AddbackRule]) -> None:
     path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
 
-def _contains_all(haystack: pd.Series, needles: list[str] | None) -> pd.Series:
-    if not needles:
-        return pd.Series([True] * len(haystack), index=haystack.index)
-    h = haystack.astype(str).str.lower().fillna("")
-    mask = pd.Series([True] * len(h), index=h.index)
-    for n in needles:
+def _lower_text(s: pd.Series) -> tuple[np.ndarray, pd.Series]:
+    """Split a text column into (codes, lowercased distinct values).
+
+    Ledger text repeats heavily, so lowercasing and needle scans run over the
+    distinct values and are broadcast back to rows through ``codes``.
+    """
+    codes, uniques = pd.factorize(s, use_na_sentinel=False)
+    return codes, pd.Series(uniques).astype(str).str.lower().fillna("")
+
+
+def _contains_all(
+    haystack: tuple[np.ndarray, pd.Series],
+    needles: list[str] | None,
+    hits: dict[str, np.ndarray] | None = None,
+) -> np.ndarray:
+    """Rows of a ``_lower_text`` column that contain every needle.
+
+    Each needle is a plain substring scan over the distinct values. ``hits``
+    memoizes the per-needle result so a needle shared by several rules is
+    scanned only once.
+    """
+    codes, uniques = haystack
+    mask = None
+    for n in needles or []:
         n0 = str(n).strip().lower()
         if not n0:
             continue
-        mask = mask & h.str.contains(n0, na=False)
-    return mask
+        found = hits.get(n0) if hits is not None else None
+        if found is None:
+            found = uniques.str.contains(n0, regex=False, na=False).to_numpy(dtype=bool)
+            if hits is not None:
+                hits[n0] = found
+        mask = found if mask is None else mask & found
+    if mask is None:
+        return np.ones(len(codes), dtype=bool)
+    return mask[codes]
+
+
+def _append_reasons(reasons: np.ndarray, labels: list[str], masks: list[np.ndarray]) -> np.ndarray:
+    """Append ``labels[j]`` (comma separated, in order) to rows where ``masks[j]`` holds.
+
+    Rows share few distinct label combinations, so each combination's text is
+    built once and broadcast back to the rows.
+    """
+    hits = np.column_stack(masks)
+    combos, inverse = np.unique(hits, axis=0, return_inverse=True)
+    combo_text = np.array([", ".join(labels[j] for j in np.flatnonzero(row)) for row in combos], dtype=object)
+    added = combo_text[inverse.reshape(-1)]
+    joined = np.where(reasons != "", reasons + ", ", reasons) + added
+    return np.where(added != "", joined, reasons)
 
 
 def apply_rules_to_df(
@@ -148,45 +197,56 @@ def apply_rules_to_df(
     The built-in payroll rule is treated as recurring starting payroll_start.
     """
 
-    out = df.copy()
-    if "sde_addback_flag" not in out.columns:
-        out["sde_addback_flag"] = False
-    if "sde_addback_reason" not in out.columns:
-        out["sde_addback_reason"] = ""
-
-    out["date"] = pd.to_datetime(out.get("date"), errors="coerce")
-
-    account_s = out.get("account", pd.Series([""] * len(out), index=out.index))
-    name_s = out.get("name", pd.Series([""] * len(out), index=out.index))
-    memo_s = out.get("memo", pd.Series([""] * len(out), index=out.index))
-    amt_s = pd.to_numeric(out.get("amount", 0.0), errors="coerce").fillna(0.0).abs()
+    # Accumulate flags/reasons in flat arrays and attach them once at the end,
+    # rather than copying the whole ledger up front.
+    n = len(df)
+    if "sde_addback_flag" in df.columns:
+        flags = df["sde_addback_flag"].to_numpy(dtype=bool, copy=True)
+    else:
+        flags = np.zeros(n, dtype=bool)
+    if "sde_addback_reason" in df.columns:
+        reasons = df["sde_addback_reason"].fillna("").astype(str).to_numpy(dtype=object, copy=True)
+    else:
+        reasons = np.full(n, "", dtype=object)
+
+    dates = pd.to_datetime(df.get("date"), errors="coerce")
+
+    # Lowercase the text columns once for all rules
+    blank = pd.Series([""] * n, index=df.index)
+    account_s = _lower_text(df.get("account", blank))
+    name_s = _lower_text(df.get("name", blank))
+    memo_s = _lower_text(df.get("memo", blank))
+    amt = pd.to_numeric(df.get("amount", 0.0), errors="coerce").fillna(0.0).abs().to_numpy(dtype=float)
+    account_hits: dict[str, np.ndarray] = {}
+    name_hits: dict[str, np.ndarray] = {}
+    memo_hits: dict[str, np.ndarray] = {}
+    matched_names: list[str] = []
+    matched_masks: list[np.ndarray] = []
 
     for rule in rules:
         tol = float(rule.amount_tolerance) if rule.amount_tolerance is not None else 0.01
 
-        mask = pd.Series([True] * len(out), index=out.index)
-        mask = mask & _contains_all(account_s, rule.account_contains)
-        mask = mask & _contains_all(name_s, rule.name_contains)
-        mask = mask & _contains_all(memo_s, rule.memo_contains)
+        mask = (
+            _contains_all(account_s, rule.account_contains, account_hits)
+            & _contains_all(name_s, rule.name_contains, name_hits)
+            & _contains_all(memo_s, rule.memo_contains, memo_hits)
+        )
 
         # Recurring payroll rule boundary
         if rule.name == "weekly_payroll_addback_2880":
             start_dt = pd.to_datetime(payroll_start)
-            mask = mask & (out["date"] >= start_dt)
+            mask &= (dates >= start_dt).to_numpy(dtype=bool)
 
         if rule.amount is not None:
             target = abs(float(rule.amount))
-            mask = mask & (amt_s.sub(target).abs() <= tol)
+            mask &= np.abs(amt - target) <= tol
 
-        if not mask.any():
-            continue
-
-        out.loc[mask, "sde_addback_flag"] = True
+        if mask.any():
+            matched_names.append(rule.name)
+            matched_masks.append(mask)
 
-        # Append reason
-        existing = out.loc[mask, "sde_addback_reason"].astype(str).fillna("")
-        suffix = f"rule={rule.name}"
-        sep = existing.apply(lambda x: ", " if x else "")
-        out.loc[mask, "sde_addback_reason"] = existing + sep + suffix
+    if matched_masks:
+        flags |= np.logical_or.reduce(matched_masks)
+        reasons = _append_reasons(reasons, [f"rule={name}" for name in matched_names], matched_masks)
 
-    return out
+    return df.assign(sde_addback_flag=flags, sde_addback_reason=reasons, date=dates)
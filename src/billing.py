@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import hashlib
+import io
 from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
 from typing import Literal
 
 import pandas as pd
 
 
 CostType = Literal["material", "labor", "supervision"]
+COST_TYPES: tuple[CostType, ...] = ("material", "labor", "supervision")
+
+# Bump when load_green_sheets changes its output so cached pickles are not reused.
+GREEN_SHEETS_CACHE_VERSION = 2
+GREEN_SHEETS_CACHE_KEEP = 8
 
 
 @dataclass
@@ -25,6 +34,9 @@ class JobBillingConfig:
 class JobInvoice:
     """
     Represents the computed invoice for a single job over a period.
+
+    The derived amounts are computed on first access and cached, so the cost
+    fields should not be modified afterwards.
     """
     job: str
     period_label: str
@@ -34,28 +46,28 @@ class JobInvoice:
     overhead_pct: float
     profit_pct: float
 
-    @property
+    @cached_property
     def base_cost(self) -> float:
         """
         Raw cost before markup: materials + labor + supervision.
         """
         return self.materials + self.labor + self.supervision
 
-    @property
+    @cached_property
     def overhead_amount(self) -> float:
         """
         Overhead calculated as a percentage of base_cost.
         """
         return round(self.base_cost * self.overhead_pct, 2)
 
-    @property
+    @cached_property
     def profit_amount(self) -> float:
         """
         Profit/fee calculated as a percentage of (base_cost + overhead).
         """
         return round((self.base_cost + self.overhead_amount) * self.profit_pct, 2)
 
-    @property
+    @cached_property
     def total(self) -> float:
         """
         Final invoice total = base_cost + overhead + profit.
@@ -78,6 +90,7 @@ def load_green_sheets(df: pd.DataFrame) -> pd.DataFrame:
         - ref        (optional; check # or reference)
 
     This function should be tolerant of slightly different source column names.
+    Rows are returned in date order (undated rows last).
     """
     gs = df.copy()
 
@@ -114,12 +127,60 @@ def load_green_sheets(df: pd.DataFrame) -> pd.DataFrame:
     gs["date"] = pd.to_datetime(gs["date"], errors="coerce")
     gs["amount"] = pd.to_numeric(gs["amount"], errors="coerce").fillna(0.0)
 
-    # Normalize cost_type strings
-    gs["cost_type"] = gs["cost_type"].astype(str).str.lower().str.strip()
+    # Normalize cost_type strings into a categorical. The billable types come
+    # first; any other value found in the sheet is kept as an extra category
+    # rather than being turned into NaN. Equality checks such as
+    # gs["cost_type"] == "material" keep working and compare integer codes.
+    cost_type = gs["cost_type"].astype(str).str.lower().str.strip()
+    extra = sorted(set(cost_type.dropna().unique()) - set(COST_TYPES))
+    gs["cost_type"] = pd.Categorical(cost_type, categories=list(COST_TYPES) + extra)
+
+    # Few distinct jobs per sheet: store them as categoricals too
+    job = gs["job"]
+    if job.nunique(dropna=False) <= max(len(job) // 2, 1):
+        gs["job"] = job.astype("category")
+
+    # Date order lets billing windows be located by binary search
+    gs = gs.sort_values("date", kind="stable")
 
     return gs
 
 
+def load_green_sheets_from_path(path: Path, cache_dir: Path | None = None) -> pd.DataFrame:
+    """
+    Read a green-sheet CSV/XLSX export and normalize it via load_green_sheets.
+
+    With ``cache_dir`` set, the normalized frame is pickled there keyed by the
+    file contents, GREEN_SHEETS_CACHE_VERSION and the pandas version, so
+    re-reading an unchanged sheet skips parsing and normalization. Only the
+    newest GREEN_SHEETS_CACHE_KEEP pickles are kept.
+    """
+    data = path.read_bytes()
+    suffix = path.suffix.lower()
+
+    cache_path = None
+    if cache_dir is not None:
+        h = hashlib.blake2b(data, digest_size=16)
+        h.update(f"|{suffix}|{GREEN_SHEETS_CACHE_VERSION}|{pd.__version__}".encode())
+        cache_path = cache_dir / f"gs_{h.hexdigest()}.pkl"
+        if cache_path.exists():
+            return pd.read_pickle(cache_path)
+
+    if suffix in {".xlsx", ".xls"}:
+        raw = pd.read_excel(io.BytesIO(data), sheet_name=0)
+    else:
+        raw = pd.read_csv(io.BytesIO(data))
+    gs = load_green_sheets(raw)
+
+    if cache_path is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        gs.to_pickle(cache_path)
+        stale = sorted(cache_dir.glob("gs_*.pkl"), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+        for old in stale[GREEN_SHEETS_CACHE_KEEP:]:
+            old.unlink(missing_ok=True)
+    return gs
+
+
 def compute_job_invoice(
     gs: pd.DataFrame,
     job_cfg: JobBillingConfig,
@@ -130,11 +191,8 @@ def compute_job_invoice(
     Compute the invoice for a single job over [period_start, period_end],
     based purely on green-sheet costs inside that window.
     """
-    mask = (
-        (gs["job"] == job_cfg.job)
-        & (gs["date"] >= pd.to_datetime(period_start))
-        & (gs["date"] <= pd.to_datetime(period_end))
-    )
+    ps, pe = pd.Timestamp(period_start), pd.Timestamp(period_end)
+    mask = (gs["job"] == job_cfg.job) & (gs["date"] >= ps) & (gs["date"] <= pe)
     subset = gs.loc[mask].copy()
 
     materials = subset.loc[subset["cost_type"] == "material", "amount"].sum()
@@ -165,11 +223,37 @@ def compute_period_billing(
         job, period, materials, labor, supervision,
         overhead_pct, profit_pct, overhead_amount, profit_amount, invoice_total
     """
-    invoices: list[JobInvoice] = []
+    # Apply the date window once and total every job's costs by type in a
+    # single groupby, instead of masking the sheet once per job.
+    ps, pe = pd.Timestamp(period_start), pd.Timestamp(period_end)
+    dates = gs["date"]
+    if dates.is_monotonic_increasing:
+        lo, hi = dates.searchsorted(ps, side="left"), dates.searchsorted(pe, side="right")
+        window = gs.iloc[lo:hi]
+    else:
+        window = gs.loc[(dates >= ps) & (dates <= pe)]
+    totals = (
+        window.groupby(["job", "cost_type"], observed=True)["amount"]
+        .sum()
+        .astype(float)
+        .unstack(fill_value=0.0)
+        .reindex(index=[cfg.job for cfg in job_configs], columns=list(COST_TYPES), fill_value=0.0)
+    )
 
-    for cfg in job_configs:
-        inv = compute_job_invoice(gs, cfg, period_start, period_end)
-        invoices.append(inv)
+    # JobInvoice keeps the markup/rounding rules identical to compute_job_invoice
+    period_label = f"{period_start} → {period_end}"
+    invoices = [
+        JobInvoice(
+            job=cfg.job,
+            period_label=period_label,
+            materials=round(materials, 2),
+            labor=round(labor, 2),
+            supervision=round(supervision, 2),
+            overhead_pct=cfg.overhead_pct,
+            profit_pct=cfg.profit_pct,
+        )
+        for cfg, (materials, labor, supervision) in zip(job_configs, totals.itertuples(index=False))
+    ]
 
     rows: list[dict] = []
     for inv in invoices:
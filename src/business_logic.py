@@ -2,6 +2,37 @@ import pandas as pd
 import numpy as np
 import re
 
+from src.addback_rules import AddbackRule, parse_rule, apply_rules_to_df, _append_reasons
+
+# Labels of the `classification` column, in category-code order.
+CLASSIFICATION_LABELS = ["Revenue", "COGS", "Overhead", "Other", "Unclassified", "Balance Sheet"]
+
+# Account-type substrings used by is_pnl_account_type (and its vectorized twin
+# in classify_transactions).
+BALANCE_SHEET_TOKENS = (
+    "bank",
+    "accounts payable",
+    "accounts receivable",
+    "credit card",
+    "fixed asset",
+    "other current asset",
+    "other current liability",
+    "long term liability",
+    "equity",
+)
+PNL_TOKENS = (
+    "income",
+    "expense",
+    "cost of goods sold",
+    "cogs",
+    "other income",
+    "other expense",
+)
+_BALANCE_SHEET_RE = re.compile("|".join(re.escape(t) for t in BALANCE_SHEET_TOKENS))
+_PNL_RE = re.compile("|".join(re.escape(t) for t in PNL_TOKENS))
+_OTHER_INCOME_EXPENSE_RE = re.compile("other expense|other income")
+_EXPENSE_LIKE_RE = re.compile("expense|cost of goods sold|cogs")
+
 
 def is_pnl_account_type(account_type: str) -> bool:
     """Return True if an account_type looks like a P&L account type.
@@ -28,47 +59,22 @@ def is_pnl_account_type(account_type: str) -> bool:
         return True
 
     # Explicit balance sheet categories
-    balance_sheet_tokens = [
-        "bank",
-        "accounts payable",
-        "accounts receivable",
-        "credit card",
-        "fixed asset",
-        "other current asset",
-        "other current liability",
-        "long term liability",
-        "equity",
-    ]
-    if any(t in s for t in balance_sheet_tokens):
+    if any(t in s for t in BALANCE_SHEET_TOKENS):
         return False
 
     # Explicit P&L categories
-    pnl_tokens = [
-        "income",
-        "expense",
-        "cost of goods sold",
-        "cogs",
-        "other income",
-        "other expense",
-    ]
-    return any(t in s for t in pnl_tokens)
-
+    return any(t in s for t in PNL_TOKENS)
 
-def _net_to_positive(total: float) -> float:
-    """Convert a signed net total into a positive magnitude.
 
-    This codebase needs to handle two common ledger sign conventions:
-    - QuickBooks GL exports often represent Income as negative (credits) and Expenses as positive (debits).
-    - Some test fixtures / other exports represent Income as positive and Expenses as negative.
+def _addback_total(amounts: np.ndarray) -> float:
+    """Positive magnitude of flagged addback amounts.
 
-    For reporting, we want Revenue/COGS/Overhead/etc. as positive magnitudes.
+    Ledgers that carry both debit and credit lines would double count, so we
+    prefer whichever sign is present: QB exports tend to use + for expenses,
+    some fixtures use -.
     """
-    try:
-        total_f = float(total)
-    except Exception:
-        return 0.0
-
-    return -total_f if total_f < 0 else total_f
+    positive = amounts[amounts > 0].sum()
+    return float(positive) if positive else float(-amounts[amounts < 0].sum())
 
 
 def account_code_prefix(account: str) -> str | None:
@@ -110,122 +116,124 @@ def classify_transactions(df: pd.DataFrame, cogs_prefixes: set[str] | None = Non
 
     QuickBooks Transaction Detail exports often mark job costs as account_type="Expense".
     We therefore use account-code prefixes (e.g., 704-708) to identify COGS.
+
+    Returns a new frame with the flag columns added; the input is not modified.
     """
-    df = df.copy()
 
     if cogs_prefixes is None:
         cogs_prefixes = {"704", "705", "706", "707", "708"}
 
-    atype = (
-        df["account_type"]
-        if "account_type" in df.columns
-        else pd.Series([""] * len(df), index=df.index)
-    ).astype(str).str.lower().fillna("")
-
-    # Mark P&L vs balance-sheet rows
-    df["is_pnl"] = atype.map(is_pnl_account_type)
-
-    account_series = (
-        df["account"]
-        if "account" in df.columns
-        else pd.Series([""] * len(df), index=df.index)
-    ).astype(str)
+    # Account types and accounts repeat heavily (load_ledger keeps them as
+    # categoricals), so every string test runs once per distinct value and is
+    # broadcast back to rows through the factorize codes.
+    blank = pd.Series("", index=df.index)
+    atype_codes, atype = pd.factorize(df.get("account_type", blank), use_na_sentinel=False)
+    atype = pd.Series(atype).astype(str).str.lower().fillna("")
+    account_codes, account_series = pd.factorize(df.get("account", blank), use_na_sentinel=False)
+    account_series = pd.Series(account_series).astype(str)
     account_lower = account_series.str.lower().fillna("")
 
-    df["account_prefix"] = account_series.map(extract_account_prefix)
+    # The classification depends only on the (account_type, account) pair, so
+    # it is worked out once per distinct pair in one fused pass over small
+    # arrays, then broadcast back to rows.
+    n_accounts = max(len(account_series), 1)
+    pairs, pair_codes = np.unique(atype_codes * n_accounts + account_codes, return_inverse=True)
+    pair_codes = pair_codes.reshape(-1)
+    t, a = pairs // n_accounts, pairs % n_accounts
+
+    def by_type(mask: pd.Series) -> np.ndarray:
+        return mask.to_numpy(dtype=bool)[t]
+
+    def by_account(mask: pd.Series) -> np.ndarray:
+        return mask.to_numpy(dtype=bool)[a]
+
+    # Mark P&L vs balance-sheet rows (same rules as is_pnl_account_type)
+    atype_stripped = atype.str.strip()
+    is_pnl = by_type(
+        atype_stripped.isin(["", "nan"])
+        | (~atype_stripped.str.contains(_BALANCE_SHEET_RE, na=False) & atype_stripped.str.contains(_PNL_RE, na=False))
+    )
 
-    # Initialize flags
-    df["is_revenue"] = False
-    df["is_cogs"] = False
-    df["is_overhead"] = False
-    df["is_other_expense"] = False
+    # Leading digits of the account (see extract_account_prefix); NaN when absent
+    account_prefix = account_series.str.extract(r"^\s*(\d+)", expand=False)
 
     # Revenue
-    revenue_mask = df["is_pnl"] & (atype.str.contains("income") | account_lower.str.contains("income"))
-    df.loc[revenue_mask, "is_revenue"] = True
+    is_revenue = is_pnl & (by_type(atype.str.contains("income")) | by_account(account_lower.str.contains("income")))
 
     # Other expense / other income (do not mark as overhead)
-    other_exp_mask = df["is_pnl"] & (atype.str.contains("other expense") | atype.str.contains("other income"))
-    df.loc[other_exp_mask & (~revenue_mask), "is_other_expense"] = True
+    is_other_expense = is_pnl & by_type(atype.str.contains(_OTHER_INCOME_EXPENSE_RE)) & ~is_revenue
 
     # Expense-like rows (expense/cogs) that are not already classified
-    expense_like = df["is_pnl"] & (atype.str.contains("expense") | atype.str.contains("cost of goods sold") | atype.str.contains("cogs"))
-    remaining = expense_like & (~df["is_revenue"]) & (~df["is_other_expense"])
+    expense_like = is_pnl & by_type(atype.str.contains(_EXPENSE_LIKE_RE))
+    remaining = expense_like & ~is_revenue & ~is_other_expense
 
     # COGS:
     # - Always treat explicit COGS account types as COGS
     # - Also treat Expense rows as COGS when account_prefix matches configured job-cost prefixes
-    is_explicit_cogs = atype.str.contains("cost of goods sold") | atype.str.fullmatch(r"\s*cogs\s*")
-    is_cogs_prefix = df["account_prefix"].isin(cogs_prefixes)
-
-    cogs_mask = remaining & (is_explicit_cogs | is_cogs_prefix)
-    overhead_mask = remaining & (~cogs_mask)
-
-    df.loc[cogs_mask, "is_cogs"] = True
-    df.loc[overhead_mask, "is_overhead"] = True
-
-    # Ensure mutual exclusivity
-    df.loc[df["is_revenue"], ["is_cogs", "is_overhead", "is_other_expense"]] = False
-    df.loc[df["is_other_expense"], ["is_cogs", "is_overhead"]] = False
-    df.loc[df["is_cogs"], ["is_overhead"]] = False
-
-    # Classification string column
-    df["classification"] = np.select(
-        [
-            df["is_revenue"],
-            df["is_cogs"],
-            df["is_overhead"],
-            df["is_other_expense"],
-        ],
-        ["Revenue", "COGS", "Overhead", "Other"],
-        default=np.where(df["is_pnl"] & atype.eq(""), "Unclassified", np.where(df["is_pnl"], "Other", "Balance Sheet")),
+    is_explicit_cogs = by_type(atype.str.contains("cost of goods sold") | atype.str.fullmatch(r"\s*cogs\s*"))
+    is_cogs_prefix = by_account(account_prefix.isin(cogs_prefixes))
+
+    # Revenue/other expense already exclude each other and COGS/overhead
+    is_cogs = remaining & (is_explicit_cogs | is_cogs_prefix)
+    is_overhead = remaining & ~is_cogs
+
+    # Classification column (categorical: few labels, grouped on downstream)
+    codes = np.select(
+        [is_revenue, is_cogs, is_overhead, is_other_expense],
+        [0, 1, 2, 3],
+        default=np.where(is_pnl & by_type(atype.eq("")), 4, np.where(is_pnl, 3, 5)),
     )
 
-    return df
+    return df.assign(
+        is_pnl=is_pnl[pair_codes],
+        account_prefix=account_prefix.take(account_codes).set_axis(df.index),
+        is_revenue=is_revenue[pair_codes],
+        is_cogs=is_cogs[pair_codes],
+        is_overhead=is_overhead[pair_codes],
+        is_other_expense=is_other_expense[pair_codes],
+        classification=pd.Categorical.from_codes(codes[pair_codes], categories=CLASSIFICATION_LABELS),
+    )
 
 def detect_addbacks(df: pd.DataFrame, custom_tokens=None, rules=None) -> pd.DataFrame:
-    df = df.copy()
     if custom_tokens is None:
         custom_tokens = []
 
-    df["sde_addback_flag"] = False
-    df["sde_addback_reason"] = ""
-
     # Base tokens
     # Use word boundaries for short tokens to avoid matching substrings like "Buildi(ng)"
     # We'll use regex for all just to be safe and consistent.
     # "xnp" might be a code, so maybe keep it loose? But likely distinct.
     raw_tokens = ["xnp", "ng", "nathan", "owner", "personal"] + [t.lower() for t in custom_tokens]
-
-    # We'll check name and memo
-    # Ensure they are strings (handled in data_loader, but good to be safe)
-    name_col = df["name"].astype(str).str.lower() if "name" in df.columns else pd.Series([""] * len(df))
-    memo_col = df["memo"].astype(str).str.lower() if "memo" in df.columns else pd.Series([""] * len(df))
-
-    for t in raw_tokens:
-        if not t: continue
-
-        # Escape special regex chars just in case, then wrap in word boundaries
-        # For very short tokens like 'ng', boundary is critical.
-        # For 'xnp', probably also good.
-        pattern = f"\\b{pd.io.common.re.escape(t)}\\b"
-
-        hit = name_col.str.contains(pattern, regex=True, na=False) | memo_col.str.contains(pattern, regex=True, na=False)
-
-        # Update flag
-        df.loc[hit, "sde_addback_flag"] = True
-
-        # Update reason (append if multiple matches, or just set?)
-        # Prompt says: "AUTO: token=<...>" or a small concatenation.
-        # Let's just append token if not present.
-        # This is a bit tricky with vectorization.
-        # Simple approach: apply? No, slow.
-        # Let's just set it for the hit rows.
-
-        # We can iterate and update.
-        existing_reasons = df.loc[hit, "sde_addback_reason"]
-        new_reasons = existing_reasons + (existing_reasons.apply(lambda x: ", " if x else "") + f"token={t}")
-        df.loc[hit, "sde_addback_reason"] = new_reasons
+    tokens = [t for t in raw_tokens if t]
+
+    # Escape special regex chars just in case, then wrap in word boundaries
+    # For very short tokens like 'ng', boundary is critical.
+    patterns = [rf"\b{re.escape(t)}\b" for t in tokens]
+    any_token_re = re.compile("|".join(f"(?:{p})" for p in patterns))
+
+    # We'll check name and memo. Both are factorized first so lowercasing and
+    # matching run once per distinct value. One alternation pass finds the
+    # candidates; only those are checked token by token (a single
+    # alternation can't report overlapping tokens such as "owner"/"owner draw").
+    blank = pd.Series("", index=df.index)
+    token_hits = [np.zeros(len(df), dtype=bool) for _ in tokens]
+    for col in (df.get("name", blank), df.get("memo", blank)):
+        codes, uniques = pd.factorize(col, use_na_sentinel=False)
+        uniques = pd.Series(uniques).astype(str).str.lower()
+        candidates = uniques[uniques.str.contains(any_token_re, na=False).to_numpy(dtype=bool)]
+        if candidates.empty:
+            continue
+        for hit, pattern in zip(token_hits, patterns):
+            unique_hit = np.zeros(len(uniques), dtype=bool)
+            unique_hit[candidates.index] = candidates.str.contains(pattern, regex=True, na=False).to_numpy(dtype=bool)
+            hit |= unique_hit[codes]
+    token_labels = [f"token={t}" for t in tokens]
+
+    # The base tokens are always present, so token_hits is never empty
+    # assign() returns a new frame, so the caller's frame is left untouched
+    df = df.assign(
+        sde_addback_flag=np.logical_or.reduce(token_hits),
+        sde_addback_reason=_append_reasons(np.full(len(df), "", dtype=object), token_labels, token_hits),
+    )
 
     # Optional rule engine (e.g. local JSON rules)
     if rules:
@@ -237,6 +245,74 @@ def detect_addbacks(df: pd.DataFrame, custom_tokens=None, rules=None) -> pd.Data
 
     return df
 
+def _iter_chunks(frames, chunk_size: int):
+    """Yield row slices of a DataFrame, or pass through an iterable of frames
+    (e.g. ``pd.read_csv(..., chunksize=...)``) unchanged."""
+    if isinstance(frames, pd.DataFrame):
+        # An empty frame still yields one (empty) chunk so its columns survive
+        for start in range(0, max(len(frames), 1), chunk_size):
+            yield frames.iloc[start:start + chunk_size]
+    else:
+        yield from frames
+
+def _concat_chunks(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    # The classification categories are fixed, so concat keeps the categorical dtype
+    return pd.concat(parts) if len(parts) > 1 else parts[0]
+
+def classify_transactions_streaming(
+    frames, chunk_size: int = 200_000, cogs_prefixes: set[str] | None = None
+) -> pd.DataFrame:
+    """classify_transactions over chunks of rows.
+
+    Every row is classified from its own account/account_type, so chunking
+    doesn't change the result; it bounds the intermediate arrays to one chunk
+    and lets a chunked CSV reader be classified without loading it whole.
+    """
+    parts = [classify_transactions(chunk, cogs_prefixes) for chunk in _iter_chunks(frames, chunk_size)]
+    return _concat_chunks(parts) if parts else classify_transactions(pd.DataFrame(columns=["account", "account_type"]))
+
+def detect_addbacks_streaming(frames, chunk_size: int = 200_000, custom_tokens=None, rules=None) -> pd.DataFrame:
+    """detect_addbacks over chunks of rows (see classify_transactions_streaming)."""
+    parts = [detect_addbacks(chunk, custom_tokens, rules) for chunk in _iter_chunks(frames, chunk_size)]
+    return _concat_chunks(parts) if parts else detect_addbacks(pd.DataFrame(columns=["name", "memo"]), custom_tokens)
+
+def _account_code_prefixes(df: pd.DataFrame) -> pd.Series:
+    """Vectorized account_code_prefix over df["account"] (NaN when absent).
+
+    Derived from the account_prefix column that classify_transactions adds;
+    otherwise extracted once per distinct account.
+    """
+    if "account_prefix" in df.columns:
+        prefix = df["account_prefix"]
+        # astype(str) turns missing prefixes into "nan"/"None"; keep them NaN
+        text = prefix.astype(str)
+        return text.where(prefix.notna() & (text.str.len() >= 3)).str[:3]
+
+    accounts = df.get("account", pd.Series("", index=df.index))
+    codes, values = pd.factorize(accounts, use_na_sentinel=False)
+    prefix = pd.Series(values).astype(str).str.extract(r"^\s*(\d{3})", expand=False)
+    return prefix.take(codes).set_axis(df.index)
+
+
+def date_window(df: pd.DataFrame, start: pd.Timestamp, end_exclusive: pd.Timestamp) -> pd.DataFrame:
+    """Rows with start <= date < end_exclusive.
+
+    The app keeps the ledger date-sorted, so the window is two binary searches
+    and a positional slice; unsorted input falls back to a boolean mask.
+    """
+    dates = df["date"]
+    if dates.is_monotonic_increasing:
+        lo, hi = dates.searchsorted([start, end_exclusive])
+        return df.iloc[lo:hi]
+    return df.loc[(dates >= start) & (dates < end_exclusive)]
+
+
+def _day_range(start_date, end_date) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """[start of start_date, start of the day after end_date) as Timestamps."""
+    start = pd.Timestamp(start_date).normalize()
+    return start, pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
+
+
 def get_owner_metrics(
     df: pd.DataFrame,
     owner_period_start,
@@ -247,92 +323,85 @@ def get_owner_metrics(
     legacy_job_cost_prefixes: set[str] | None = None,
 ) -> dict:
     # 1. Filter to Owner Period window
-    mask_period = (df["date"].dt.date >= owner_period_start) & (df["date"].dt.date <= current_date)
-    df_window = df[mask_period].copy()
+    df_window = date_window(df, *_day_range(owner_period_start, current_date))
 
-    # 2. Revenue (apply owner_revenue_start)
-    # Only count rows where is_revenue is True AND date >= owner_revenue_start
-    rev_mask = df_window["is_revenue"] & (df_window["date"].dt.date >= owner_revenue_start)
-
-    # Normalize sign so Revenue is always a positive magnitude.
-    revenue_raw = df_window.loc[rev_mask, "amount"].sum()
-    revenue = _net_to_positive(revenue_raw)
+    if legacy_job_cost_prefixes is None:
+        legacy_job_cost_prefixes = {"704", "705", "706", "707", "708"}
 
-    # 3. Expenses
+    # Every row gets a bit code of (flags, job-cost prefix, Aug+ period) and one
+    # bincount totals the amounts per code; each bucket below is the sum over
+    # the codes whose bits match, instead of a separate masked pass.
     # - For date >= owner_revenue_start: include all expenses normally.
     # - For owner_period_start <= date < owner_revenue_start (legacy July window):
     #   include overhead only, excluding configured job-cost prefixes.
-    # Normalize sign so each bucket is always a positive magnitude.
-
-    july_mask = (df_window["date"].dt.date >= owner_period_start) & (df_window["date"].dt.date < owner_revenue_start)
-    aug_plus_mask = df_window["date"].dt.date >= owner_revenue_start
+    # Within the window, rows not in Aug+ are the legacy July rows.
+    aug_plus = (df_window["date"] >= pd.Timestamp(owner_revenue_start).normalize()).to_numpy(dtype=bool)
+
+    # Job-cost accounts (first three digits of the account code)
+    is_job_cost_prefix = _account_code_prefixes(df_window).isin(legacy_job_cost_prefixes).to_numpy(dtype=bool)
+
+    REV, COGS, OVERHEAD, OTHER, JOB_COST, AUG = 1, 2, 4, 8, 16, 32
+    bits = (
+        df_window["is_revenue"].to_numpy(dtype=np.int64) * REV
+        | df_window["is_cogs"].to_numpy(dtype=np.int64) * COGS
+        | df_window["is_overhead"].to_numpy(dtype=np.int64) * OVERHEAD
+        | df_window["is_other_expense"].to_numpy(dtype=np.int64) * OTHER
+        | is_job_cost_prefix * JOB_COST
+        | aug_plus * AUG
+    )
+    amount = df_window["amount"].to_numpy(dtype=float, na_value=0.0)
+    bucket_totals = np.bincount(bits, weights=amount, minlength=64)
+    codes = np.arange(64)
 
-    if legacy_job_cost_prefixes is None:
-        legacy_job_cost_prefixes = {"704", "705", "706", "707", "708"}
+    def total(*, has: int = 0, lacks: int = 0, any_of: int = 0) -> float:
+        sel = ((codes & has) == has) & ((codes & lacks) == 0)
+        if any_of:
+            sel &= (codes & any_of) != 0
+        return float(bucket_totals[sel].sum())
 
-    # Compute job-cost mask (prefix-based) for July window.
-    acct_series = df_window.get("account", pd.Series([""] * len(df_window), index=df_window.index)).astype(str)
-    prefixes = acct_series.map(account_code_prefix)
-    is_job_cost_prefix = prefixes.isin(legacy_job_cost_prefixes)
-    legacy_july_job_cost_mask = july_mask & is_job_cost_prefix & (df_window["is_overhead"] | df_window["is_other_expense"] | df_window["is_cogs"])
+    expense_bits = OVERHEAD | OTHER | COGS
 
-    legacy_july_total_expense_raw = df_window.loc[
-        july_mask & (df_window["is_overhead"] | df_window["is_other_expense"] | df_window["is_cogs"]),
-        "amount",
-    ].sum()
-    legacy_july_total_expense = _net_to_positive(legacy_july_total_expense_raw)
+    # 2. Revenue (apply owner_revenue_start)
+    # Only count rows where is_revenue is True AND date >= owner_revenue_start
+    # Normalize sign so Revenue is always a positive magnitude.
+    revenue = abs(total(has=REV | AUG))
 
-    legacy_july_excluded_job_cost_raw = df_window.loc[legacy_july_job_cost_mask, "amount"].sum()
-    legacy_july_excluded_job_cost = _net_to_positive(legacy_july_excluded_job_cost_raw)
+    # 3. Expenses
+    # Normalize sign so each bucket is always a positive magnitude.
+    legacy_july_total_expense = abs(total(lacks=AUG, any_of=expense_bits))
+    legacy_july_excluded_job_cost = abs(total(has=JOB_COST, lacks=AUG, any_of=expense_bits))
 
     # COGS: owner period is Aug+ only; July is tracked separately (legacy)
-    cogs_owner_mask = df_window["is_cogs"] & aug_plus_mask
-    cogs_legacy_mask = df_window["is_cogs"] & july_mask
-
-    cogs_raw = df_window.loc[cogs_owner_mask, "amount"].sum()
-    legacy_cogs_raw = df_window.loc[cogs_legacy_mask, "amount"].sum()
-
-    cogs = _net_to_positive(cogs_raw)
-    legacy_cogs = _net_to_positive(legacy_cogs_raw)
+    cogs = abs(total(has=COGS | AUG))
+    legacy_cogs = abs(total(has=COGS, lacks=AUG))
 
     # Overhead (core P&L):
     # - Include ONLY rows on/after owner_revenue_start.
     # - July overhead is handled as an optional add-in (selected transactions) via apply_legacy_overhead_addins.
-    overhead_aug_raw = df_window.loc[df_window["is_overhead"] & aug_plus_mask, "amount"].sum()
+    overhead = abs(total(has=OVERHEAD | AUG))
 
     if exclude_legacy_july_job_costs:
-        july_overhead_mask = df_window["is_overhead"] & july_mask & (~is_job_cost_prefix)
+        legacy_july_included_overhead = abs(total(has=OVERHEAD, lacks=AUG | JOB_COST))
     else:
-        july_overhead_mask = df_window["is_overhead"] & july_mask
-
-    legacy_july_included_overhead_raw = df_window.loc[july_overhead_mask, "amount"].sum()
-    legacy_july_included_overhead = _net_to_positive(legacy_july_included_overhead_raw)
-
-    overhead_raw = overhead_aug_raw
+        legacy_july_included_overhead = abs(total(has=OVERHEAD, lacks=AUG))
 
     # Other Expense:
     # Core P&L includes only Aug+.
-    other_expense_raw = df_window.loc[df_window["is_other_expense"] & aug_plus_mask, "amount"].sum()
-
-    overhead = _net_to_positive(overhead_raw)
-    other_expense = _net_to_positive(other_expense_raw)
+    other_expense = abs(total(has=OTHER | AUG))
 
     # 4. Addbacks
     # Start with token-based flags (and optional external rule engine)
-    addback_mask = df_window.get("sde_addback_flag", pd.Series([False] * len(df_window))).copy()
+    if "sde_addback_flag" in df_window.columns:
+        addback_mask = df_window["sde_addback_flag"].to_numpy(dtype=bool)
+    else:
+        addback_mask = np.zeros(len(df_window), dtype=bool)
     # Add account-level overrides
     if addback_account_overrides:
-        acct_mask = df_window["account"].astype(str).isin(addback_account_overrides)
+        acct_mask = df_window["account"].astype(str).isin(addback_account_overrides).to_numpy(dtype=bool)
         addback_mask = addback_mask | acct_mask
 
-    # Addbacks should be a positive magnitude.
-    # To reduce double-counting in ledgers that include both debit/credit lines, prefer
-    # whichever sign is present (QB exports tend to use + for expenses; some fixtures use -).
-    addback_series = df_window.loc[addback_mask, "amount"]
-    if (addback_series > 0).any():
-        addbacks = float(addback_series[addback_series > 0].sum())
-    else:
-        addbacks = float(-addback_series[addback_series < 0].sum())
+    # Addbacks should be a positive magnitude (see _addback_total for the sign choice).
+    addbacks = _addback_total(amount[addback_mask])
 
     # 5. Metrics
     gross_profit = revenue - cogs
@@ -357,17 +426,17 @@ def get_owner_metrics(
     }
 
 
-def apply_addback_rules(df: pd.DataFrame, rules: list[dict] | None = None) -> pd.DataFrame:
-    """Apply JSON-defined addback rules to a ledger dataframe.
+def apply_addback_rules(df: pd.DataFrame, rules: list[dict | AddbackRule] | None = None) -> pd.DataFrame:
+    """Apply addback rules to a ledger dataframe.
 
-    This is a thin wrapper around src.addback_rules to keep app/business_logic imports stable.
+    Rules may be JSON dicts or already-parsed AddbackRule objects (e.g. from
+    load_rules). This is a thin wrapper around src.addback_rules to keep
+    app/business_logic imports stable.
     """
     if not rules:
         return df
 
-    from src.addback_rules import parse_rule, apply_rules_to_df
-
-    parsed = [parse_rule(r) for r in rules if isinstance(r, dict)]
+    parsed = [r if isinstance(r, AddbackRule) else parse_rule(r) for r in rules if isinstance(r, (dict, AddbackRule))]
     return apply_rules_to_df(df, parsed)
 
 
@@ -397,21 +466,22 @@ def compute_legacy_overhead_addins(
     if "is_overhead" not in df.columns:
         return 0.0
 
-    d = df.copy()
+    d = df
     if not pd.api.types.is_datetime64_any_dtype(d["date"]):
-        d["date"] = pd.to_datetime(d["date"], errors="coerce")
+        d = d.assign(date=pd.to_datetime(d["date"], errors="coerce"))
 
-    mask = (d["date"].dt.date >= legacy_start) & (d["date"].dt.date <= legacy_end) & (d["is_overhead"])
+    d = date_window(d, *_day_range(legacy_start, legacy_end))
+    mask = d["is_overhead"]
     if included_accounts:
-        mask = mask & d.get("account", pd.Series([""] * len(d), index=d.index)).astype(str).isin(included_accounts)
+        mask = mask & d.get("account", pd.Series("", index=d.index)).astype(str).isin(included_accounts)
 
     if included_row_ids:
         # Prefer explicit transaction selection when available
-        rid = d.get("_row_id", pd.Series(["" for _ in range(len(d))], index=d.index)).astype(str)
+        rid = d.get("_row_id", pd.Series("", index=d.index)).astype(str)
         mask = mask & rid.isin(included_row_ids)
 
     legacy_overhead_raw = d.loc[mask, "amount"].sum()
-    return float(_net_to_positive(legacy_overhead_raw))
+    return abs(float(legacy_overhead_raw))
 
 
 def apply_legacy_overhead_addins(metrics: dict, legacy_overhead_included_total: float = 0.0) -> dict:
@@ -452,26 +522,24 @@ def get_period_metrics(df_period: pd.DataFrame, start_date, end_date) -> dict:
     We just sum up based on flags.
     """
     # Assuming df_period is already filtered to the desired date range.
+    amount = df_period["amount"].to_numpy(dtype=float, na_value=0.0)
+
+    # The class flags are mutually exclusive, so one bucket code per row
+    # (0 = unflagged) lets a single bincount produce all four sums.
+    flags = [df_period[col].to_numpy(dtype=bool) for col in ("is_revenue", "is_cogs", "is_overhead", "is_other_expense")]
+    klass = np.select(flags, [1, 2, 3, 4], default=0)
+    sums = np.bincount(klass, weights=amount, minlength=5)
 
     # Revenue as positive magnitude
-    revenue_raw = df_period.loc[df_period["is_revenue"], "amount"].sum()
-    revenue = _net_to_positive(revenue_raw)
+    revenue = abs(float(sums[1]))
 
     # Expenses as positive magnitude
-    cogs_raw = df_period.loc[df_period["is_cogs"], "amount"].sum()
-    overhead_raw = df_period.loc[df_period["is_overhead"], "amount"].sum()
-    other_expense_raw = df_period.loc[df_period["is_other_expense"], "amount"].sum()
-
-    cogs = _net_to_positive(cogs_raw)
-    overhead = _net_to_positive(overhead_raw)
-    other_expense = _net_to_positive(other_expense_raw)
+    cogs = abs(float(sums[2]))
+    overhead = abs(float(sums[3]))
+    other_expense = abs(float(sums[4]))
 
     # Addbacks as positive magnitude (prefer one sign to reduce double counting)
-    addback_series = df_period.loc[df_period["sde_addback_flag"], "amount"]
-    if (addback_series > 0).any():
-        addbacks = float(addback_series[addback_series > 0].sum())
-    else:
-        addbacks = float(-addback_series[addback_series < 0].sum())
+    addbacks = _addback_total(amount[df_period["sde_addback_flag"].to_numpy(dtype=bool)])
 
     gross_profit = revenue - cogs
     net_profit = revenue - (cogs + overhead + other_expense)
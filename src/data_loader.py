@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import gzip
+import io
 from pathlib import Path
 from typing import Any
 
@@ -96,6 +98,43 @@ def normalize_ledger_columns(df: pd.DataFrame) -> pd.DataFrame:
 
     return df
 
+# Text columns with a handful of distinct values (QB account types) that are
+# cheaper to store and scan as categoricals.
+_CATEGORY_COLUMNS = ("account_type", "account")
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink the in-memory footprint of a normalized ledger.
+
+    Low-cardinality text columns become categoricals. Amounts are left as
+    float64 on purpose: float32 cannot represent cents exactly once totals
+    reach the hundreds of thousands.
+    """
+    for col in _CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            s = df[col]
+            if s.nunique(dropna=False) <= max(len(s) // 2, 1):
+                df[col] = s.astype("category")
+    return df
+
+
+class NamedBytesIO(io.BytesIO):
+    """In-memory file with a ``name``, standing in for Streamlit's UploadedFile.
+
+    Lets scripts hand a ledger on disk to ``load_ledger``, which seeks and
+    re-reads the buffer and picks the parser from the name's suffix.
+    """
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+    @classmethod
+    def from_path(cls, path: str | Path) -> "NamedBytesIO":
+        path = Path(path)
+        return cls(path.read_bytes(), str(path))
+
+
 def load_ledger(uploaded_file: Any) -> pd.DataFrame:
     """
     Load a QuickBooks CSV/XLSX ledger export and normalize it into a usable
@@ -114,6 +153,13 @@ def load_ledger(uploaded_file: Any) -> pd.DataFrame:
     name = getattr(uploaded_file, "name", "ledger").lower()
     suffix = Path(name).suffix
 
+    # 0) Gzipped exports (e.g. qb_export.csv.gz) upload much faster; unpack in memory
+    if suffix == ".gz":
+        uploaded_file.seek(0)
+        name = name[: -len(suffix)]
+        uploaded_file = NamedBytesIO(gzip.decompress(uploaded_file.read()), name)
+        suffix = Path(name).suffix
+
     # 1) Read raw file, no header
     if suffix == ".csv":
         # Try encodings
@@ -210,4 +256,7 @@ def load_ledger(uploaded_file: Any) -> pd.DataFrame:
     # (kept as string to avoid Arrow dtype edge cases)
     df["_row_id"] = pd.Series(range(len(df)), index=df.index).astype(str)
 
+    # 9) Dictionary-encode low-cardinality text columns
+    df = compact_dtypes(df)
+
     return df
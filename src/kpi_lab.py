@@ -3,32 +3,19 @@ import datetime as dt
 import numpy as np
 import pandas as pd
 
-from src.business_logic import _net_to_positive
-
 
 def _coerce_bool(s: pd.Series) -> pd.Series:
     try:
         return s.fillna(False).astype(bool)
     except Exception:
-        return pd.Series([False] * len(s), index=s.index)
-
-
-def _addbacks_by_month(df: pd.DataFrame) -> pd.DataFrame:
-    if "sde_addback_flag" not in df.columns:
-        return pd.DataFrame({"month": pd.PeriodIndex([], freq="M"), "addbacks": []})
-
-    flag = _coerce_bool(df["sde_addback_flag"])
-    subset = df.loc[flag].copy()
-    if subset.empty:
-        return pd.DataFrame({"month": pd.PeriodIndex([], freq="M"), "addbacks": []})
+        return pd.Series(False, index=s.index)
 
-    # Spec: sum magnitudes (robust to sign convention)
-    out_rows: list[dict] = []
-    for m, g in subset.groupby("month"):
-        addbacks = float(pd.to_numeric(g["amount"], errors="coerce").fillna(0.0).abs().sum())
-        out_rows.append({"month": m, "addbacks": addbacks})
 
-    return pd.DataFrame(out_rows)
+def _safe_divide(numer: np.ndarray, denom: np.ndarray) -> np.ndarray:
+    """Elementwise numer / denom; NaN wherever denom is zero or missing."""
+    out = np.full(len(numer), np.nan)
+    np.divide(numer, denom, out=out, where=denom != 0)
+    return out
 
 
 def compute_monthly_kpis(
@@ -81,23 +68,26 @@ def compute_monthly_kpis(
             ]
         )
 
-    d = df.copy()
-    if "date" not in d.columns:
+    if "date" not in df.columns:
         raise ValueError("compute_monthly_kpis requires a 'date' column")
-    if "amount" not in d.columns:
+    if "amount" not in df.columns:
         raise ValueError("compute_monthly_kpis requires an 'amount' column")
 
+    # Only the columns used below are copied, not the whole ledger.
+    used = [c for c in ("date", "amount", "classification", "is_revenue", "sde_addback_flag") if c in df.columns]
+    d = df[used].copy()
     d["date"] = pd.to_datetime(d["date"], errors="coerce")
-    d = d.dropna(subset=["date"]).copy()
+    d = d.dropna(subset=["date"])
     if d.empty:
         return pd.DataFrame()
 
-    d["month"] = d["date"].dt.to_period("M")
+    # Month buckets via a datetime64[M] cast; Periods are built per month, not per row.
+    d["month"] = d["date"].to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
 
     if "classification" not in d.columns:
         d["classification"] = "Other"
 
-    is_revenue = _coerce_bool(d.get("is_revenue", pd.Series([False] * len(d), index=d.index)))
+    is_revenue = _coerce_bool(d.get("is_revenue", pd.Series(False, index=d.index)))
     owner_start = pd.to_datetime(owner_revenue_start)
 
     # Apply revenue boundary: pre-owner revenue rows contribute 0 to Revenue aggregation.
@@ -106,18 +96,26 @@ def compute_monthly_kpis(
     d.loc[pre_owner_rev, "amount_kpi"] = 0.0
 
     by_class = (
-        d.groupby(["month", "classification"], dropna=False)
+        d.groupby(["month", "classification"], dropna=False, observed=True, sort=True)
         .agg(amount=("amount_kpi", "sum"))
         .reset_index()
     )
 
-    pivot = by_class.pivot_table(
-        index="month",
-        columns="classification",
-        values="amount",
-        aggfunc="sum",
-        fill_value=0.0,
-    ).reset_index()
+    # Addbacks per month: one masked bincount over month codes (spec: sum
+    # magnitudes, robust to sign convention). Codes follow sorted month order,
+    # the same order as the pivot rows below.
+    month_codes, _ = pd.factorize(d["month"], sort=True)
+    addback_amount = pd.to_numeric(d["amount"], errors="coerce").fillna(0.0).abs().to_numpy()
+    if "sde_addback_flag" in d.columns:
+        addback_amount = np.where(_coerce_bool(d["sde_addback_flag"]).to_numpy(), addback_amount, 0.0)
+    else:
+        addback_amount = np.zeros(len(d))
+    addbacks = np.bincount(month_codes, weights=addback_amount, minlength=month_codes.max() + 1)
+
+    # (month, classification) pairs are already unique: reshape, don't re-aggregate.
+    pivot = by_class.set_index(["month", "classification"])["amount"].unstack("classification", fill_value=0.0)
+    pivot.columns = pivot.columns.astype(object)
+    pivot = pivot.reset_index()
 
     rename_map = {
         "Revenue": "revenue_raw",
@@ -133,64 +131,39 @@ def compute_monthly_kpis(
             pivot[col] = 0.0
 
     # Normalize signs into positive magnitudes for display
-    pivot["revenue"] = pivot["revenue_raw"].map(_net_to_positive)
-    pivot["cogs"] = pivot["cogs_raw"].map(_net_to_positive)
-    pivot["overhead"] = pivot["overhead_raw"].map(_net_to_positive)
-    pivot["other_expense"] = pivot["other_expense_raw"].map(_net_to_positive)
-
-    pivot["gross_profit"] = pivot["revenue"] - pivot["cogs"]
-    pivot["net_profit"] = pivot["gross_profit"] - pivot["overhead"] - pivot["other_expense"]
-
-    addbacks = _addbacks_by_month(d[["month", "amount", "sde_addback_flag"]].copy())
-    pivot = pivot.merge(addbacks, on="month", how="left")
-    pivot["addbacks"] = pivot["addbacks"].fillna(0.0)
-
-    pivot["sde"] = pivot["net_profit"] + pivot["addbacks"]
-
-    pivot = pivot.sort_values("month").reset_index(drop=True)
-    pivot["month_str"] = pivot["month"].dt.to_timestamp().dt.strftime("%b %Y")
-
-    # Margins (as decimals), avoid divide by zero (return None)
-    rev = pivot["revenue"].astype(float)
-
-    def _safe_divide(numer: pd.Series, denom: pd.Series) -> pd.Series:
-        out: list[float | None] = []
-        for n, d0 in zip(numer.tolist(), denom.tolist()):
-            try:
-                d_f = float(d0)
-            except Exception:
-                d_f = 0.0
-            if d_f == 0.0:
-                out.append(None)
-                continue
-            try:
-                out.append(float(n) / d_f)
-            except Exception:
-                out.append(None)
-        return pd.Series(out, index=numer.index)
-
-    pivot["gross_margin_pct"] = _safe_divide(pivot["gross_profit"], rev)
-    pivot["net_margin_pct"] = _safe_divide(pivot["net_profit"], rev)
-    pivot["sde_margin_pct"] = _safe_divide(pivot["sde"], rev)
-    pivot["overhead_pct"] = _safe_divide(pivot["overhead"], rev)
-    pivot["cogs_pct"] = _safe_divide(pivot["cogs"], rev)
+    pivot["revenue"] = pivot["revenue_raw"].abs()
+    pivot["cogs"] = pivot["cogs_raw"].abs()
+    pivot["overhead"] = pivot["overhead_raw"].abs()
+    pivot["other_expense"] = pivot["other_expense_raw"].abs()
+
+    # Derived P&L lines straight from the underlying arrays (no Series temporaries)
+    gross_profit = pivot["revenue"].to_numpy(dtype=float) - pivot["cogs"].to_numpy(dtype=float)
+    net_profit = gross_profit - pivot["overhead"].to_numpy(dtype=float) - pivot["other_expense"].to_numpy(dtype=float)
+    pivot["gross_profit"] = gross_profit
+    pivot["net_profit"] = net_profit
+    pivot["addbacks"] = addbacks
+    pivot["sde"] = net_profit + addbacks
+
+    # Rows are already in month order (sorted groupby keys survive the unstack).
+    pivot["month_str"] = pivot["month"].dt.strftime("%b %Y")
+    pivot["month"] = pivot["month"].dt.to_period("M")
+
+    # Margins (as decimals), avoid divide by zero (NaN)
+    rev = pivot["revenue"].to_numpy(dtype=float)
+
+    pivot["gross_margin_pct"] = _safe_divide(pivot["gross_profit"].to_numpy(dtype=float), rev)
+    pivot["net_margin_pct"] = _safe_divide(pivot["net_profit"].to_numpy(dtype=float), rev)
+    pivot["sde_margin_pct"] = _safe_divide(pivot["sde"].to_numpy(dtype=float), rev)
+    pivot["overhead_pct"] = _safe_divide(pivot["overhead"].to_numpy(dtype=float), rev)
+    pivot["cogs_pct"] = _safe_divide(pivot["cogs"].to_numpy(dtype=float), rev)
 
     # MoM deltas
     for metric in ["revenue", "net_profit", "sde"]:
-        prev = pivot[metric].shift(1)
-        delta = pivot[metric] - prev
-        pct_vals: list[float | None] = []
-        for dlt, p in zip(delta.tolist(), prev.tolist()):
-            try:
-                p_f = float(p)
-            except Exception:
-                p_f = 0.0
-            if p_f == 0.0:
-                pct_vals.append(None)
-                continue
-            pct_vals.append(float(dlt) / p_f)
-        pct = pd.Series(pct_vals, index=pivot.index)
+        cur = pivot[metric].to_numpy(dtype=float)
+        prev = np.full_like(cur, np.nan)
+        prev[1:] = cur[:-1]
+        delta = cur - prev
         pivot[f"{metric}_mom_delta"] = delta
-        pivot[f"{metric}_mom_pct"] = pct
+        pivot[f"{metric}_mom_pct"] = _safe_divide(delta, prev)
 
     return pivot
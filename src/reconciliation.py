@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date, timedelta
+from datetime import date
 from typing import Optional, Dict, Any
 
+import numpy as np
 import pandas as pd
 
 
@@ -152,6 +153,80 @@ def normalize_bank_register(df_bank: pd.DataFrame) -> pd.DataFrame:
 # Matching engine
 # --------------------------------------------------------------------
 
+def to_day_numbers(dates: pd.Series) -> np.ndarray:
+    """Calendar day numbers (days since epoch) as float; NaT becomes NaN."""
+    days = dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    out = days.astype("int64").astype(float)
+    out[np.isnat(days)] = np.nan
+    return out
+
+
+def _column_or_blank(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col in df.columns:
+        return df[col].to_numpy()
+    return np.full(len(df), "", dtype=object)
+
+
+def match_pairs(
+    qb_amounts: np.ndarray,
+    qb_days: np.ndarray,
+    bank_amounts: np.ndarray,
+    bank_days: np.ndarray,
+    date_tolerance_days: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Greedy one-to-one matching kernel on plain arrays.
+
+    QB rows are visited in order; each takes the not-yet-used bank row with
+    the same amount in whole cents whose date is closest and within
+    ±date_tolerance_days. Ties go to the earlier bank row.
+
+    Returns positional indices (qb_pos, bank_pos) of the matched pairs.
+    """
+    qb_ok = ~(np.isnan(qb_amounts) | np.isnan(qb_days))
+    bank_ok = ~(np.isnan(bank_amounts) | np.isnan(bank_days))  # skip NaN amount / NaT date
+    qb_cents = np.rint(qb_amounts[qb_ok] * 100).astype(np.int64)
+    bank_cents = np.rint(bank_amounts[bank_ok] * 100).astype(np.int64)
+
+    # Sort usable bank rows by (cents, day, position): each amount bucket is a
+    # contiguous run whose days are ascending, so the date window is a binary search.
+    bank_valid = np.flatnonzero(bank_ok)
+    order = np.lexsort((bank_days[bank_valid], bank_cents))
+    sorted_pos = bank_valid[order]
+    sorted_days = bank_days[sorted_pos]
+    keys, starts = np.unique(bank_cents[order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+    buckets = {cents: (lo, hi) for cents, lo, hi in zip(keys.tolist(), starts.tolist(), ends.tolist())}
+
+    used = np.zeros(len(bank_amounts), dtype=bool)
+    qb_out: list[int] = []
+    bank_out: list[int] = []
+
+    for qb_i, cents in zip(np.flatnonzero(qb_ok).tolist(), qb_cents.tolist()):
+        bucket = buckets.get(cents)
+        if bucket is None:
+            continue
+        day = qb_days[qb_i]
+
+        start, stop = bucket
+        bucket_days = sorted_days[start:stop]
+        lo = start + int(np.searchsorted(bucket_days, day - date_tolerance_days, side="left"))
+        hi = start + int(np.searchsorted(bucket_days, day + date_tolerance_days, side="right"))
+        cand = sorted_pos[lo:hi]
+        free = ~used[cand]
+        if not free.any():
+            continue
+
+        cand = cand[free]
+        diffs = np.abs(sorted_days[lo:hi][free] - day)
+        best = int(cand[diffs == diffs.min()].min())
+        used[best] = True
+        qb_out.append(qb_i)
+        bank_out.append(best)
+
+    return np.asarray(qb_out, dtype=np.int64), np.asarray(bank_out, dtype=np.int64)
+
+
 def match_qb_and_bank(
     qb_df: pd.DataFrame,
     bank_df: pd.DataFrame,
@@ -160,7 +235,8 @@ def match_qb_and_bank(
 ) -> MatchResult:
     """
     Fuzzy match QB ledger rows to bank rows using:
-      - exact amount match within ±amount_tolerance
+      - exact amount match after rounding to cents (amount_tolerance is
+        accepted for API compatibility but not used by the matching kernel)
       - date within ±date_tolerance_days
 
     Returns:
@@ -179,72 +255,38 @@ def match_qb_and_bank(
     qb["amount_round"] = qb["amount"].round(2)
     bank["amount_round"] = bank["amount"].round(2)
 
-    # Normalize dates to date objects (remove time) for comparison
-    qb["date_obj"] = qb["date"].dt.date
-    bank["date_obj"] = bank["date"].dt.date
-
-    # For efficiency on larger sets we can do a simple loop by amount.
-    matched_rows = []
-    used_bank_indices = set()
-
-    # Build index of bank rows by rounded amount
-    bank_groups = bank.groupby("amount_round", sort=False)
-
-    for qb_idx, qb_row in qb.iterrows():
-        amt = qb_row["amount_round"]
-        if amt not in bank_groups.groups:
-            continue
-
-        candidate_indices = bank_groups.groups[amt]
-        candidate_bank = bank.loc[candidate_indices]
-        
-        # Date window
-        d_qb = qb_row["date_obj"]
-        if pd.isna(d_qb):
-            continue
-            
-        min_date = d_qb - timedelta(days=date_tolerance_days)
-        max_date = d_qb + timedelta(days=date_tolerance_days)
-
-        mask = candidate_bank["date_obj"].between(min_date, max_date)
-        candidate_bank = candidate_bank[mask]
-
-        # Exclude already matched bank rows
-        candidate_bank = candidate_bank[~candidate_bank.index.isin(used_bank_indices)]
-
-        if candidate_bank.empty:
-            continue
+    qb_pos, bank_pos = match_pairs(
+        qb["amount_round"].to_numpy(dtype=float),
+        to_day_numbers(qb["date"]),
+        bank["amount_round"].to_numpy(dtype=float),
+        to_day_numbers(bank["date"]),
+        date_tolerance_days,
+    )
 
-        # Choose the closest date as match
-        # Calculate absolute difference in days
-        # We need to handle the date difference calculation carefully
-        
-        date_diffs = candidate_bank["date_obj"].apply(lambda d: abs((d - d_qb).days))
-        best_bank_idx = date_diffs.idxmin()
-        best_bank_row = bank.loc[best_bank_idx]
-
-        matched_rows.append(
-            {
-                "qb_index": qb_idx,
-                "bank_index": best_bank_idx,
-                "qb_date": qb_row["date"],
-                "qb_amount": qb_row["amount"],
-                "qb_description": qb_row.get("description", ""),
-                "qb_account": qb_row.get("account", ""),
-                "bank_date": best_bank_row["date"],
-                "bank_amount": best_bank_row["amount"],
-                "bank_description": best_bank_row.get("description", ""),
-            }
-        )
-        used_bank_indices.add(best_bank_idx)
-
-    matched_df = pd.DataFrame(matched_rows)
+    qb_hit = qb.iloc[qb_pos]
+    bank_hit = bank.iloc[bank_pos]
+    matched_df = pd.DataFrame(
+        {
+            "qb_index": qb.index[qb_pos],
+            "bank_index": bank.index[bank_pos],
+            "qb_date": qb_hit["date"].to_numpy(),
+            "qb_amount": qb_hit["amount"].to_numpy(),
+            "qb_description": _column_or_blank(qb_hit, "description"),
+            "qb_account": _column_or_blank(qb_hit, "account"),
+            "bank_date": bank_hit["date"].to_numpy(),
+            "bank_amount": bank_hit["amount"].to_numpy(),
+            "bank_description": _column_or_blank(bank_hit, "description"),
+        }
+    )
 
     # Unmatched sets
-    matched_qb_indices = set(matched_df["qb_index"]) if not matched_df.empty else set()
-    unmatched_qb = qb[~qb.index.isin(matched_qb_indices)].copy()
+    qb_is_matched = np.zeros(len(qb), dtype=bool)
+    qb_is_matched[qb_pos] = True
+    unmatched_qb = qb[~qb_is_matched].copy()
 
-    unmatched_bank = bank[~bank.index.isin(used_bank_indices)].copy()
+    bank_is_matched = np.zeros(len(bank), dtype=bool)
+    bank_is_matched[bank_pos] = True
+    unmatched_bank = bank[~bank_is_matched].copy()
 
     return MatchResult(
         matched=matched_df,
@@ -271,7 +313,9 @@ def compute_cash_basis_pl(
     """
     b = bank_df.copy()
     b["date"] = pd.to_datetime(b["date"], errors="coerce")
-    mask = b["date"].dt.date.between(start_date, end_date)
+    # Compare datetime64 values against day bounds instead of per-row date objects
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date) + pd.Timedelta(days=1)
+    mask = (b["date"] >= start) & (b["date"] < end)
     b = b.loc[mask]
 
     inflow = b.loc[b["amount"] > 0, "amount"].sum()
@@ -304,19 +348,27 @@ def compute_accrual_pl_from_qb(
     """
     q = qb_df.copy()
     q["date"] = pd.to_datetime(q["date"], errors="coerce")
-    mask = q["date"].dt.date.between(start_date, end_date)
+    # Compare datetime64 values against day bounds instead of per-row date objects
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date) + pd.Timedelta(days=1)
+    mask = (q["date"] >= start) & (q["date"] < end)
     q = q.loc[mask]
 
-    atype = q.get("account_type", "").astype(str).str.lower()
+    # Few distinct account types (a categorical after load_ledger): test each
+    # type once and map the result to rows through the factorize codes.
+    type_codes, atype = pd.factorize(q["account_type"], use_na_sentinel=False)
+    atype = pd.Series(atype).astype(str).str.lower()
+
+    def rows_where(type_mask: pd.Series) -> np.ndarray:
+        return type_mask.to_numpy(dtype=bool)[type_codes]
 
     # Income accounts: credits negative in GL -> flip sign
     # We check strict matching or contains
-    income_mask = atype.str.contains("income")
+    income_mask = rows_where(atype.str.contains("income"))
     income_amount = q.loc[income_mask, "amount"].sum()
     revenue_accrual = -income_amount  # flip sign to positive
 
     # COGS
-    cogs_mask = atype.str.contains("cost of goods sold")
+    cogs_mask = rows_where(atype.str.contains("cost of goods sold"))
     cogs_raw = q.loc[cogs_mask, "amount"].sum()
     cogs = abs(cogs_raw)
 
@@ -325,7 +377,7 @@ def compute_accrual_pl_from_qb(
     # be careful not to double count if we have 'other expense'
     # Let's use contains 'expense' but maybe exclude 'cost of goods sold' if it was named 'Expense'?
     # Safer:
-    exp_mask = atype.str.contains("expense") & ~atype.str.contains("income")
+    exp_mask = rows_where(atype.str.contains("expense")) & ~income_mask
     # Note: 'cost of goods sold' usually doesn't contain 'expense' string
     
     exp_raw = q.loc[exp_mask, "amount"].sum()
@@ -45,6 +45,49 @@ def test_streamlit_app():
     assert tab_statuses, "Expected at least one tab to validate"
     assert all(status != "UNKNOWN" for status in tab_statuses.values())
 
+
+LEDGER_PATH = os.getenv("LEDGER_PATH", "qb_export.csv")
+
+# Tabs of the simplified dashboard and the debug marker each one renders.
+APP_TABS = {
+    "Overview": "OVERVIEW",
+    "Addbacks": "ADDBACKS",
+    "Reconciliation": "RECONCILIATION",
+}
+
+
+@pytest.fixture(scope="session")
+def ledger_page():
+    """Headless page with the ledger uploaded once, shared by every tab check.
+
+    Browser start-up and ledger processing dominate a browser run, so both
+    happen once per session. Skips when Playwright, the app or the ledger
+    file is unavailable.
+    """
+    sync_api = pytest.importorskip("playwright.sync_api")
+    _get(BASE_URL.rstrip("/") + "/_stcore/health", timeout=5.0)
+    if not os.path.exists(LEDGER_PATH):
+        pytest.skip(f"Ledger file not found: {LEDGER_PATH}")
+
+    with sync_api.sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.goto(BASE_URL.rstrip("/") + "/?debug=1")
+        page.locator("input[type='file']").first.set_input_files(LEDGER_PATH)
+        page.wait_for_selector("text=TAB_OK::OVERVIEW", timeout=30000)
+        yield page
+        browser.close()
+
+
+@pytest.mark.parametrize("label,key", list(APP_TABS.items()))
+def test_tab_renders(ledger_page, label, key):
+    # One test per tab so a failure names its tab and the run can be split
+    # across workers (pytest -n); each worker uploads the ledger once.
+    ledger_page.get_by_role("tab", name=label).click()
+    ledger_page.wait_for_selector(f"text=TAB_OK::{key}", timeout=10000)
+    assert ledger_page.locator("[data-testid='stException']").count() == 0
+
+
 def create_browser_test_script():
     """Create a more comprehensive browser automation script"""
     
@@ -0,0 +1,48 @@
+import pandas as pd
+
+from src.addback_rules import apply_rules_to_df, load_rules, parse_rule
+from src.business_logic import detect_addbacks
+
+
+def test_apply_rules_requires_every_needle_and_amount_within_tolerance():
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2025-08-01"] * 4),
+            "account": ["6100 Owner Auto", "6100 Owner Auto", "6000 Rent", "6100 Owner (Auto)"],
+            "name": ["", "", "", ""],
+            "memo": ["Gas\nfor truck", "Gas", "truck gas", "Gas for truck"],
+            "amount": [-50.0, 50.0, 50.0, 50.5],
+        }
+    )
+    rule = parse_rule(
+        {"name": "truck", "account_contains": "owner", "memo_contains": ["gas", "truck"], "amount": 50, "amount_tolerance": 1}
+    )
+    paren_rule = parse_rule({"name": "paren", "account_contains": "(auto)"})
+
+    out = apply_rules_to_df(df, [rule, paren_rule])
+
+    # Needles may sit on different lines; all of them must be present
+    assert list(out["sde_addback_flag"]) == [True, False, False, True]
+    # Needles are literal text, not regex
+    assert list(out["sde_addback_reason"]) == ["rule=truck", "", "", "rule=truck, rule=paren"]
+
+
+def test_detect_addbacks_accepts_rules_from_load_rules(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text('[{"name": "rent", "account_contains": "rent"}]', encoding="utf-8")
+    rules = load_rules(path)
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2025-08-01", "2025-08-02"]),
+            "account": ["6000 Rent", "6100 Fuel"],
+            "name": ["", ""],
+            "memo": ["", ""],
+            "amount": [100.0, 20.0],
+        }
+    )
+
+    out = detect_addbacks(df, rules=rules)
+
+    assert list(out["sde_addback_flag"]) == [True, False]
+    # Unchanged file: the cached parse is reused
+    assert load_rules(path) == rules
@@ -2,7 +2,8 @@
 import datetime as dt
 import pandas as pd
 
-from src.billing import load_green_sheets, JobBillingConfig, compute_period_billing
+from src import billing
+from src.billing import load_green_sheets, load_green_sheets_from_path, JobBillingConfig, compute_period_billing
 
 
 def test_simple_billing_two_jobs():
@@ -54,3 +55,55 @@ def test_simple_billing_two_jobs():
 
     # Combined
     assert df["invoice_total"].sum() == 40_425.0
+
+
+def test_load_green_sheets_from_path_caches_normalized_frame(tmp_path):
+    sheet = tmp_path / "green.csv"
+    sheet.write_text("Project,Date,Total,Cost Type\nHoward,2025-11-10,5000,Labor\nHoward,2025-11-05,10000,material\n")
+    cache_dir = tmp_path / "cache"
+
+    gs = load_green_sheets_from_path(sheet, cache_dir=cache_dir)
+    assert list(gs["amount"]) == [10_000.0, 5_000.0]
+    assert len(list(cache_dir.glob("gs_*.pkl"))) == 1
+
+    # Unchanged contents are served from the cache
+    pd.testing.assert_frame_equal(load_green_sheets_from_path(sheet, cache_dir=cache_dir), gs)
+
+    sheet.write_text("Project,Date,Total,Cost Type\nLynn,2025-11-07,20000,material\n")
+    assert list(load_green_sheets_from_path(sheet, cache_dir=cache_dir)["job"]) == ["Lynn"]
+    assert len(list(cache_dir.glob("gs_*.pkl"))) == 2
+
+
+def test_load_green_sheets_cache_key_includes_normalization_version(tmp_path, monkeypatch):
+    sheet = tmp_path / "green.csv"
+    sheet.write_text("Project,Date,Total,Cost Type\nHoward,2025-11-10,5000,Labor\n")
+    cache_dir = tmp_path / "cache"
+
+    load_green_sheets_from_path(sheet, cache_dir=cache_dir)
+    monkeypatch.setattr(billing, "GREEN_SHEETS_CACHE_VERSION", billing.GREEN_SHEETS_CACHE_VERSION + 1)
+    load_green_sheets_from_path(sheet, cache_dir=cache_dir)
+
+    # A new normalization version misses the old pickle
+    assert len(list(cache_dir.glob("gs_*.pkl"))) == 2
+
+
+def test_load_green_sheets_keeps_unknown_cost_types():
+    raw = pd.DataFrame(
+        {
+            "job": ["Howard", "Howard"],
+            "date": ["2025-11-05", "2025-11-06"],
+            "amount": [10_000.0, 700.0],
+            "cost_type": ["material", " Equipment"],
+        }
+    )
+
+    gs = load_green_sheets(raw)
+
+    # Unknown types stay visible instead of becoming NaN...
+    assert list(gs["cost_type"]) == ["material", "equipment"]
+
+    # ...and are still left out of the billable totals
+    cfg = JobBillingConfig(job="Howard", overhead_pct=0.0, profit_pct=0.0)
+    df = compute_period_billing(gs, [cfg], dt.date(2025, 11, 1), dt.date(2025, 11, 30))
+    assert df.iloc[0]["materials"] == 10_000.0
+    assert df.iloc[0]["invoice_total"] == 10_000.0
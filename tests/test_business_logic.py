@@ -6,9 +6,12 @@ import pytest
 from src.business_logic import (
     classify_transactions,
     detect_addbacks,
+    classify_transactions_streaming,
+    detect_addbacks_streaming,
     get_owner_metrics,
     compute_legacy_overhead_addins,
     apply_legacy_overhead_addins,
+    _account_code_prefixes,
 )
 
 
@@ -171,3 +174,21 @@ def test_apply_legacy_overhead_addins_adjusts_net_and_sde():
     assert out["overhead"] == 275.0
     assert out["net_profit"] == 575.0
     assert out["sde"] == 585.0
+
+
+def test_streaming_variants_match_whole_frame(sample_df_qb_signs):
+    df = sample_df_qb_signs
+
+    whole = detect_addbacks(classify_transactions(df))
+    streamed = detect_addbacks_streaming(classify_transactions_streaming(df, chunk_size=2), chunk_size=3)
+
+    pd.testing.assert_frame_equal(streamed, whole)
+
+
+def test_account_code_prefixes_keep_missing_prefixes_missing():
+    df = pd.DataFrame({"account_prefix": pd.Series(["705", None, "86", float("nan")], dtype=object)})
+
+    prefixes = _account_code_prefixes(df)
+
+    assert prefixes.iloc[0] == "705"
+    assert prefixes.iloc[1:].isna().all()
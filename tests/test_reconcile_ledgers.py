@@ -0,0 +1,49 @@
+import pandas as pd
+
+from reconcile_ledgers import reconcile
+
+
+def _bank(amounts, dates):
+    return pd.DataFrame(
+        {
+            "Transaction Date": dates,
+            "Transaction Description": [f"b{i}" for i in range(len(amounts))],
+            "Amount": [str(a) for a in amounts],
+            "amount": amounts,
+            "date": pd.to_datetime(dates),
+        }
+    )
+
+
+def _qb(amounts, dates):
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(dates),
+            "name": [f"q{i}" for i in range(len(amounts))],
+            "num": [""] * len(amounts),
+            "amount": amounts,
+        }
+    )
+
+
+def test_reconcile_uses_isclose_tolerance_for_large_amounts():
+    bank = _bank([-30_000.00, -100.00], ["2025-07-01", "2025-07-01"])
+    qb = _qb([-30_000.25, -100.05], ["2025-07-03", "2025-07-01"])
+
+    matches, unmatched_bank, unmatched_qb = reconcile(bank, qb)
+
+    # atol=0.01 plus the default rtol=1e-5 allows ~$0.31 on $30k, not $0.05 on $100
+    assert [m["QB_Name"] for m in matches] == ["q0"]
+    assert list(unmatched_bank["Transaction Description"]) == ["b1"]
+
+
+def test_reconcile_tries_inverted_sign_per_bank_row_in_order():
+    bank = _bank([100.0, -100.0], ["2025-07-01", "2025-07-01"])
+    qb = _qb([-100.0], ["2025-07-01"])
+
+    matches, unmatched_bank, _ = reconcile(bank, qb)
+
+    # The first bank row has no same-sign candidate, so it takes the QB row
+    # with the sign inverted before the second bank row is considered.
+    assert [m["Bank_Desc"] for m in matches] == ["b0"]
+    assert list(unmatched_bank["Transaction Description"]) == ["b1"]
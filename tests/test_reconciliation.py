@@ -0,0 +1,30 @@
+import pandas as pd
+from src.reconciliation import match_qb_and_bank
+
+
+def test_match_qb_and_bank_picks_closest_unused_bank_row():
+    qb = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2025-07-10", "2025-07-10", "2025-07-20"]),
+            "amount": [100.0, 100.0, 55.5],
+            "description": ["a", "b", "c"],
+            "account": ["x", "x", "y"],
+        }
+    )
+    bank = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2025-07-13", "2025-07-11", "2025-07-01", None]),
+            "amount": [100.0, 100.0, 55.5, 55.5],
+            "description": ["b1", "b2", "b3", "b4"],
+        }
+    )
+
+    result = match_qb_and_bank(qb, bank, date_tolerance_days=3)
+
+    # First QB row takes the nearest bank row, second falls back to the other one
+    assert list(result.matched["qb_index"]) == [0, 1]
+    assert list(result.matched["bank_index"]) == [1, 0]
+
+    # 55.50 is outside the window and the undated bank row never matches
+    assert list(result.unmatched_qb.index) == [2]
+    assert list(result.unmatched_bank.index) == [2, 3]